@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""YOLOX INT8 Quantization Tool.
+
+UIP - Urban Intelligence Platform
+Copyright (c) 2025 UIP Team. All rights reserved.
+https://github.com/UIP-Urban-Intelligence-Platform/UIP-Urban_Intelligence_Platform
+
+SPDX-License-Identifier: MIT
+
+Module: scripts.quantize_yolox
+Author: Nguyen Nhat Quang
+Created: 2025-12-08
+Version: 1.0.0
+License: MIT
+
+Description:
+    Exports YOLOX PyTorch weights to ONNX and produces an INT8 model with
+    ONNX Runtime dynamic quantization. The CV agent loads the INT8 model when
+    cv_analysis.model.precision is set to "int8" and the device is CPU.
+
+    With --calibrate it also writes a TensorRT INT8 calibration table for the
+    FP32 ONNX model, computed from cached camera images. On CUDA the CV agent
+    runs that model through ONNX Runtime's TensorRT provider in INT8 and
+    caches the built engine next to the table.
+
+    The exported graph keeps YOLOX's decode step, so its output has the same
+    layout as the PyTorch model and goes through the same postprocess/NMS.
+
+Usage:
+    python scripts/quantize_yolox.py [--model MODEL_NAME] [--weights PATH]
+
+    Examples:
+        python scripts/quantize_yolox.py                              # yolox-x (cv_config default)
+        python scripts/quantize_yolox.py --model yolox-s \\
+            --weights assets/models/yolox_s.pth                       # Smaller variant
+        python scripts/quantize_yolox.py --calibrate                  # + TensorRT table
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Default model (matches config/cv_config.yaml)
+DEFAULT_MODEL = "yolox-x"
+
+# Model directory
+MODELS_DIR = Path(__file__).parent.parent / "assets" / "models"
+
+# ONNX opset used for export
+DEFAULT_OPSET = 14
+
+# TensorRT INT8 calibration inputs and output (matches config/cv_config.yaml)
+CALIBRATION_IMAGES_DIR = Path(__file__).parent.parent / "data" / "cache" / "images"
+DEFAULT_CALIBRATION_IMAGES = 200
+TRT_CACHE_DIR = MODELS_DIR / "trt_cache"
+
+
+def export_onnx(model_name: str, weights: Path, output: Path, opset: int) -> None:
+    """
+    Export YOLOX PyTorch weights to an FP32 ONNX model.
+
+    Args:
+        model_name: YOLOX variant (e.g., 'yolox-s')
+        weights: Path to .pth weights
+        output: Destination .onnx path
+        opset: ONNX opset version
+    """
+    import torch
+    from yolox.exp import get_exp
+
+    exp = get_exp(None, model_name.replace("yolox-", "yolox_"))
+    model = exp.get_model()
+
+    ckpt = torch.load(weights, map_location="cpu")
+    model.load_state_dict(ckpt["model"] if "model" in ckpt else ckpt)
+    model.eval()
+    model.head.decode_in_inference = True
+
+    dummy_input = torch.zeros(1, 3, *exp.test_size)
+    torch.onnx.export(
+        model,
+        dummy_input,
+        str(output),
+        input_names=["images"],
+        output_names=["output"],
+        opset_version=opset,
+    )
+    logger.info(f"✅ Exported FP32 ONNX model: {output}")
+
+
+def quantize(fp32_model: Path, int8_model: Path) -> None:
+    """
+    Quantize an FP32 ONNX model to INT8 weights.
+
+    Args:
+        fp32_model: Source FP32 .onnx path
+        int8_model: Destination INT8 .onnx path
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(str(fp32_model), str(int8_model), weight_type=QuantType.QInt8)
+
+    fp32_mb = fp32_model.stat().st_size / (1024 * 1024)
+    int8_mb = int8_model.stat().st_size / (1024 * 1024)
+    logger.info(
+        f"✅ Quantized INT8 model: {int8_model} ({fp32_mb:.1f} MB -> {int8_mb:.1f} MB)"
+    )
+
+
+def calibrate(
+    model_name: str,
+    fp32_model: Path,
+    images_dir: Path,
+    cache_dir: Path,
+    num_images: int,
+) -> None:
+    """
+    Write a TensorRT INT8 calibration table for an FP32 ONNX model.
+
+    Args:
+        model_name: YOLOX variant (e.g., 'yolox-s'), for the input size
+        fp32_model: Source FP32 .onnx path
+        images_dir: Directory of calibration images
+        cache_dir: TensorRT cache directory receiving the table
+        num_images: Maximum number of images to calibrate on
+    """
+    import numpy as np
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        CalibrationMethod,
+        create_calibrator,
+        write_calibration_table,
+    )
+    from PIL import Image
+    from yolox.data.data_augment import ValTransform
+    from yolox.exp import get_exp
+
+    image_paths = sorted(
+        path
+        for path in images_dir.iterdir()
+        if path.suffix.lower() in (".jpg", ".jpeg", ".png")
+    )[:num_images]
+    if not image_paths:
+        raise FileNotFoundError(f"No calibration images in {images_dir}")
+
+    test_size = get_exp(None, model_name.replace("yolox-", "yolox_")).test_size
+    preproc = ValTransform(legacy=False)
+
+    class ImageReader(CalibrationDataReader):
+        """Feeds images preprocessed exactly as YOLOXDetector.detect does."""
+
+        def __init__(self):
+            self.paths = iter(image_paths)
+
+        def get_next(self):
+            path = next(self.paths, None)
+            if path is None:
+                return None
+            img = np.array(Image.open(path).convert("RGB"))
+            tensor, _ = preproc(img, None, test_size)
+            return {"images": tensor[None].astype(np.float32)}
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    calibrator = create_calibrator(
+        str(fp32_model),
+        [],
+        augmented_model_path=str(cache_dir / "augmented_model.onnx"),
+        calibrate_method=CalibrationMethod.MinMax,
+    )
+    calibrator.set_execution_providers(
+        ["CUDAExecutionProvider", "CPUExecutionProvider"]
+    )
+    calibrator.collect_data(ImageReader())
+    write_calibration_table(calibrator.compute_data(), dir=str(cache_dir))
+    logger.info(
+        f"✅ Wrote TensorRT calibration table to {cache_dir} "
+        f"({len(image_paths)} images)"
+    )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Export YOLOX to ONNX and quantize it to INT8 for CPU inference",
+    )
+
+    parser.add_argument(
+        "--model",
+        "-m",
+        type=str,
+        default=DEFAULT_MODEL,
+        help=f"YOLOX variant (default: {DEFAULT_MODEL})",
+    )
+
+    parser.add_argument(
+        "--weights",
+        "-w",
+        type=str,
+        default=None,
+        help="PyTorch weights (default: assets/models/<variant>.pth)",
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        "-o",
+        type=str,
+        default=str(MODELS_DIR),
+        help=f"Output directory (default: {MODELS_DIR})",
+    )
+
+    parser.add_argument(
+        "--opset",
+        type=int,
+        default=DEFAULT_OPSET,
+        help=f"ONNX opset version (default: {DEFAULT_OPSET})",
+    )
+
+    parser.add_argument(
+        "--calibrate",
+        action="store_true",
+        help="Also write a TensorRT INT8 calibration table for CUDA inference",
+    )
+
+    parser.add_argument(
+        "--calibration-images",
+        type=str,
+        default=str(CALIBRATION_IMAGES_DIR),
+        help=f"Calibration image directory (default: {CALIBRATION_IMAGES_DIR})",
+    )
+
+    parser.add_argument(
+        "--num-calibration-images",
+        type=int,
+        default=DEFAULT_CALIBRATION_IMAGES,
+        help=f"Images used for calibration (default: {DEFAULT_CALIBRATION_IMAGES})",
+    )
+
+    parser.add_argument(
+        "--trt-cache-dir",
+        type=str,
+        default=str(TRT_CACHE_DIR),
+        help=f"TensorRT calibration/engine cache (default: {TRT_CACHE_DIR})",
+    )
+
+    args = parser.parse_args()
+
+    stem = args.model.lower().replace("-", "_")
+    output_dir = Path(args.output_dir)
+    weights = Path(args.weights) if args.weights else MODELS_DIR / f"{stem}.pth"
+
+    if not weights.exists():
+        logger.error(f"Weights not found: {weights}")
+        logger.info("Download with: python scripts/download_yolox_weights.py")
+        return 1
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fp32_model = output_dir / f"{stem}.onnx"
+    int8_model = output_dir / f"{stem}_int8.onnx"
+
+    try:
+        export_onnx(args.model.lower(), weights, fp32_model, args.opset)
+        quantize(fp32_model, int8_model)
+        if args.calibrate:
+            calibrate(
+                args.model.lower(),
+                fp32_model,
+                Path(args.calibration_images),
+                Path(args.trt_cache_dir),
+                args.num_calibration_images,
+            )
+    except ImportError as e:
+        logger.error(f"Missing dependency: {e}")
+        logger.info("Install with: pip install yolox onnx onnxruntime")
+        return 1
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -30,6 +30,7 @@ Dependencies:
     - requests>=2.28: HTTP client
     - PyYAML>=6.0: Configuration parsing
     - asyncpg>=0.29: PostgreSQL async driver (Apache-2.0 - MIT compatible)
+    - ijson>=3.1 (optional): Streaming parse of observation files
 
 Configuration:
     config/congestion_config.yaml:
@@ -59,9 +60,10 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import asyncpg
+import numpy as np
 import requests
 import yaml
 
@@ -70,6 +72,14 @@ from src.core.config_loader import expand_env_var
 # HTTP requests for real-time publishing
 import requests as http_requests
 
+# Optional: incremental JSON parsing for large observation files
+try:
+    import ijson
+
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -431,17 +441,7 @@ class CongestionDetector:
         occupancy = self._get_value(entity, "occupancy")
         avg_speed = self._get_value(entity, "averageSpeed")
         intensity = self._get_value(entity, "intensity")
-
-        observed_at = None
-        # Try to find observedAt from intensity/intensity property
-        for prop in ("intensity", "occupancy", "averageSpeed"):
-            p = entity.get(prop)
-            if isinstance(p, dict):
-                observed_at = p.get("observedAt")
-                if observed_at:
-                    break
-        if not observed_at:
-            observed_at = now_iso()
+        observed_at = self._get_observed_at(entity)
 
         # Default missing values to False in comparisons
         occ_ok = occupancy is not None and occupancy > self.occupancy_thresh
@@ -453,15 +453,86 @@ class CongestionDetector:
         else:
             breached = occ_ok or speed_ok or int_ok
 
+        reason = (
+            f"occ={occupancy}, speed={avg_speed}, int={intensity}, logic={self.logic}"
+        )
+        return self._decide(camera_ref, breached, reason, observed_at)
+
+    def evaluate_many(
+        self, entities: List[Dict[str, Any]]
+    ) -> List[Optional[Tuple[bool, bool, Optional[str], str]]]:
+        """
+        Evaluate congestion for several entities at once.
+
+        The threshold comparisons run as NumPy array operations over all
+        entities (missing values are NaN, which compares False); only the
+        per-camera state transition stays per entity. State is read, not
+        written, so results equal evaluate() called on each entity in turn.
+
+        Returns:
+            One evaluate() tuple per entity, or None where evaluation failed
+        """
+        props = {
+            prop: [self._get_value(entity, prop) for entity in entities]
+            for prop in ("occupancy", "averageSpeed", "intensity")
+        }
+        # float64 arrays turn missing (None) values into NaN
+        occupancy, avg_speed, intensity = (
+            np.array(values, dtype=np.float64) for values in props.values()
+        )
+
+        checks = (
+            occupancy > self.occupancy_thresh,
+            avg_speed < self.avg_speed_thresh,
+            intensity > self.intensity_thresh,
+        )
+        if self.logic == "AND":
+            breached = np.logical_and.reduce(checks)
+        else:
+            breached = np.logical_or.reduce(checks)
+
+        results: List[Optional[Tuple[bool, bool, Optional[str], str]]] = []
+        for i, entity in enumerate(entities):
+            try:
+                camera_ref = self._get_camera_ref(entity)
+                if not camera_ref:
+                    raise ValueError("Cannot determine camera reference from entity")
+                reason = (
+                    f"occ={props['occupancy'][i]}, speed={props['averageSpeed'][i]}, "
+                    f"int={props['intensity'][i]}, logic={self.logic}"
+                )
+                results.append(
+                    self._decide(
+                        camera_ref,
+                        bool(breached[i]),
+                        reason,
+                        self._get_observed_at(entity),
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Skipping entity due to evaluation error: {e}")
+                results.append(None)
+        return results
+
+    @staticmethod
+    def _get_observed_at(entity: Dict[str, Any]) -> str:
+        # Try to find observedAt from intensity/occupancy/averageSpeed property
+        for prop in ("intensity", "occupancy", "averageSpeed"):
+            p = entity.get(prop)
+            if isinstance(p, dict):
+                observed_at = p.get("observedAt")
+                if observed_at:
+                    return observed_at
+        return now_iso()
+
+    def _decide(
+        self, camera_ref: str, breached: bool, reason: str, observed_at: str
+    ) -> Tuple[bool, bool, Optional[str], str]:
         # Determine new congested state considering min_duration and previous state
         prev_state = self.state_store.get(camera_ref)
         prev_congested = bool(prev_state.get("congested", False))
         first_breach_ts = prev_state.get("first_breach_ts")
 
-        reason = (
-            f"occ={occupancy}, speed={avg_speed}, int={intensity}, logic={self.logic}"
-        )
-
         if breached:
             if prev_congested:
                 # Already congested, no change
@@ -819,6 +890,38 @@ class CongestionDetectionAgent:
         else:
             entities = []
 
+        return self.process_entities(entities)
+
+    def process_observations_stream(self, input_file: str) -> List[Dict[str, Any]]:
+        """
+        Like process_observations_file, but parses a top-level JSON array
+        incrementally with ijson.
+
+        Each observation is evaluated as soon as it is parsed, so the raw
+        array is never held in memory as a whole. Object-shaped files, or
+        environments without ijson, fall back to process_observations_file.
+        """
+        input_path = Path(input_file)
+        if not input_path.exists():
+            raise FileNotFoundError(f"Observations file not found: {input_file}")
+
+        with open(input_path, "rb") as f:
+            # Only a top-level array can be streamed item by item
+            head = f.read(64).lstrip()
+            if not IJSON_AVAILABLE or not head.startswith(b"["):
+                return self.process_observations_file(input_file)
+            f.seek(0)
+            return self.process_entities(ijson.items(f, "item", use_float=True))
+
+    def process_entities(
+        self, entities: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate observation entities and update Stellio when congestion state changes.
+
+        entities may be any iterable (e.g. a streaming parser); it is consumed once.
+        Returns list of result dicts with camera_ref, updated(bool), success(bool), status_code, error
+        """
         results: List[Dict[str, Any]] = []
         to_update: List[Tuple[str, Dict[str, Any], Dict[str, Any], bool]] = (
             []
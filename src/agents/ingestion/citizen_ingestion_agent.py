@@ -66,6 +66,7 @@ Example Request:
     }
 """
 
+import asyncio
 import json
 import logging
 import os
@@ -97,6 +98,14 @@ except ImportError:
     FASTAPI_AVAILABLE = False
     logging.error("FastAPI not available - install with: pip install fastapi uvicorn")
 
+# uvloop (installed with uvicorn[standard]) is the faster event loop for serving
+try:
+    import uvloop  # noqa: F401
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Async HTTP Client
 try:
     import aiohttp
@@ -550,12 +559,40 @@ class NGSILDTransformer:
 # Background Task Processor
 # ============================================================================
 
+# Completion events for background processing, keyed by report ID.
+# Set once enrichment and Stellio publishing finish (successfully or not),
+# so callers can await completion instead of sleeping.
+pending_events: Dict[str, asyncio.Event] = {}
+
+# Oldest events are dropped beyond this bound so unawaited reports
+# do not accumulate for the lifetime of the server
+MAX_PENDING_EVENTS = 1000
+
+
+def register_pending_report(report_id: str) -> asyncio.Event:
+    """
+    Create the completion event for a report about to be processed.
+
+    Args:
+        report_id: Report UUID returned to the client
+
+    Returns:
+        Event set when background processing for the report finishes
+    """
+    while len(pending_events) >= MAX_PENDING_EVENTS:
+        pending_events.pop(next(iter(pending_events)))
+
+    event = asyncio.Event()
+    pending_events[report_id] = event
+    return event
+
 
 async def process_citizen_report_background(
     report: CitizenReport,
     weather_enricher: WeatherEnricher,
     aq_enricher: AirQualityEnricher,
     transformer: NGSILDTransformer,
+    report_id: Optional[str] = None,
 ):
     """
     Background task: Enrich report with external data and publish to Stellio.
@@ -567,6 +604,7 @@ async def process_citizen_report_background(
         weather_enricher: Weather API client
         aq_enricher: Air quality API client
         transformer: NGSI-LD transformer and Stellio publisher
+        report_id: Optional report UUID whose pending event is set on completion
     """
     logger.info(f"🚀 Processing report: {report.reportType}")
 
@@ -596,6 +634,11 @@ async def process_citizen_report_background(
     except Exception as e:
         logger.error(f"💥 Background task failed: {e}", exc_info=True)
 
+    finally:
+        event = pending_events.get(report_id) if report_id else None
+        if event is not None:
+            event.set()
+
 
 # ============================================================================
 # API Endpoints
@@ -664,12 +707,14 @@ if FASTAPI_AVAILABLE:
         report_id = str(uuid.uuid4())
 
         # Schedule background processing
+        register_pending_report(report_id)
         background_tasks.add_task(
             process_citizen_report_background,
             report,
             weather_enricher,
             aq_enricher,
             transformer,
+            report_id,
         )
 
         return ReportResponse(
@@ -721,8 +766,6 @@ if FASTAPI_AVAILABLE:
 # Main Entry Point
 # ============================================================================
 
-import asyncio
-
 
 def main():
     """Run FastAPI server with uvicorn."""
@@ -740,6 +783,7 @@ def main():
         port=8001,
         reload=True,
         log_level="info",
+        loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
     )
 
 
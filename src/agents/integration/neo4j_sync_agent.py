@@ -104,6 +104,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Expanded JSON-LD key of a Property's value
+NGSI_HAS_VALUE = "https://uri.etsi.org/ngsi-ld/hasValue"
+
+# Default for dict.get() where None is a legitimate value
+_MISSING = object()
+
 
 # ============================================================================
 # Configuration Loader
@@ -624,28 +630,32 @@ class Neo4jSyncAgent:
         # Handle JSON-LD object with @value or hasValue
         if isinstance(data, dict):
             # Direct @value
-            if "@value" in data:
-                return data["@value"]
+            value = data.get("@value", _MISSING)
+            if value is not _MISSING:
+                return value
 
             # NGSI-LD simple format
-            if "value" in data:
-                return data["value"]
-
-            # JSON-LD expanded format with hasValue
-            for key in data.keys():
-                if "hasValue" in key:
-                    has_value_data = data[key]
-                    # hasValue is usually an array
-                    if isinstance(has_value_data, list) and len(has_value_data) > 0:
-                        value_item = has_value_data[0]
-                        if isinstance(value_item, dict) and "@value" in value_item:
-                            return value_item["@value"]
-                        return value_item
-                    elif (
-                        isinstance(has_value_data, dict) and "@value" in has_value_data
-                    ):
-                        return has_value_data["@value"]
-                    return has_value_data
+            value = data.get("value", _MISSING)
+            if value is not _MISSING:
+                return value
+
+            # JSON-LD expanded format with hasValue: the standard IRI is a
+            # direct lookup; other spellings need a scan of the keys
+            if NGSI_HAS_VALUE in data:
+                key = NGSI_HAS_VALUE
+            else:
+                key = next((key for key in data if "hasValue" in key), None)
+            if key is not None:
+                has_value_data = data[key]
+                # hasValue is usually an array
+                if isinstance(has_value_data, list) and len(has_value_data) > 0:
+                    value_item = has_value_data[0]
+                    if isinstance(value_item, dict) and "@value" in value_item:
+                        return value_item["@value"]
+                    return value_item
+                elif isinstance(has_value_data, dict) and "@value" in has_value_data:
+                    return has_value_data["@value"]
+                return has_value_data
 
         # Direct value (fallback)
         return data
@@ -674,31 +684,36 @@ class Neo4jSyncAgent:
             if isinstance(rel_data, dict) and "object" in rel_data:
                 return rel_data["object"]
 
-        # Try JSON-LD expanded format
-        # Search for keys containing the relationship name
-        for key in payload.keys():
-            if rel_name.lower() in key.lower():
-                rel_data = payload[key]
-
-                # Handle array wrapper (JSON-LD format)
-                if isinstance(rel_data, list) and len(rel_data) > 0:
-                    rel_data = rel_data[0]
-
-                if isinstance(rel_data, dict):
-                    # Look for hasObject property
-                    for obj_key in rel_data.keys():
-                        if "hasObject" in obj_key or "object" in obj_key:
-                            obj_value = rel_data[obj_key]
-                            # Handle array format
-                            if isinstance(obj_value, list) and len(obj_value) > 0:
-                                obj_item = obj_value[0]
-                                if isinstance(obj_item, dict) and "@id" in obj_item:
-                                    return obj_item["@id"]
-                            # Handle direct format
-                            elif isinstance(obj_value, dict) and "@id" in obj_value:
-                                return obj_value["@id"]
-                            elif isinstance(obj_value, str):
-                                return obj_value
+        # Try JSON-LD expanded format: the expanded IRI normally ends with
+        # "/<rel_name>"; otherwise search for keys containing the name
+        suffix = "/" + rel_name
+        keys = [key for key in payload if key.endswith(suffix)]
+        if not keys:
+            rel_lower = rel_name.lower()
+            keys = [key for key in payload if rel_lower in key.lower()]
+
+        for key in keys:
+            rel_data = payload[key]
+
+            # Handle array wrapper (JSON-LD format)
+            if isinstance(rel_data, list) and len(rel_data) > 0:
+                rel_data = rel_data[0]
+
+            if isinstance(rel_data, dict):
+                # Look for hasObject property
+                for obj_key in rel_data.keys():
+                    if "hasObject" in obj_key or "object" in obj_key:
+                        obj_value = rel_data[obj_key]
+                        # Handle array format
+                        if isinstance(obj_value, list) and len(obj_value) > 0:
+                            obj_item = obj_value[0]
+                            if isinstance(obj_item, dict) and "@id" in obj_item:
+                                return obj_item["@id"]
+                        # Handle direct format
+                        elif isinstance(obj_value, dict) and "@id" in obj_value:
+                            return obj_value["@id"]
+                        elif isinstance(obj_value, str):
+                            return obj_value
 
         return None
 
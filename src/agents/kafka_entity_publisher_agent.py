@@ -72,10 +72,26 @@ from typing import Any, Dict, List
 
 from kafka import KafkaProducer
 
+# orjson encodes straight to bytes (optional, see requirements/prod.txt)
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _serialize_value(value: Any) -> bytes:
+    """Serialize a Kafka message value to UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
+
+
 class KafkaEntityPublisherAgent:
     """Agent that publishes NGSI-LD entities to Kafka for Stellio"""
 
@@ -106,7 +122,7 @@ class KafkaEntityPublisherAgent:
             logger.info(f"Connecting to Kafka at {self.kafka_servers}...")
             self.producer = KafkaProducer(
                 bootstrap_servers=self.kafka_servers,
-                value_serializer=lambda v: json.dumps(v).encode("utf-8"),
+                value_serializer=_serialize_value,
                 key_serializer=lambda k: k.encode("utf-8") if k else None,
                 acks="all",  # Wait for all replicas
                 retries=3,
@@ -73,6 +73,7 @@ import re
 import smtplib
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -789,9 +790,7 @@ class AlertDispatcher:
             "timestamp": datetime.utcnow().isoformat(),
         }
 
-        # Deliver to each channel
-        success = False
-
+        targets = []
         for channel_name in channels:
             channel = self.channels.get(channel_name)
 
@@ -799,18 +798,38 @@ class AlertDispatcher:
                 logger.warning(f"Channel not available: {channel_name}")
                 continue
 
-            try:
-                delivered = channel.deliver(message)
+            targets.append((channel_name, channel))
+
+        if not targets:
+            return False
+
+        success = False
+
+        # Deliver to all channels concurrently: an alert takes as long as the
+        # slowest channel instead of the sum, and one channel's error does not
+        # affect the others. The pool lives for this alert only, so its
+        # threads are joined before returning.
+        with ThreadPoolExecutor(
+            max_workers=len(targets), thread_name_prefix="alert-delivery"
+        ) as pool:
+            deliveries = [
+                (channel_name, pool.submit(channel.deliver, message))
+                for channel_name, channel in targets
+            ]
+
+            for channel_name, delivery in deliveries:
+                try:
+                    delivered = delivery.result()
 
-                if delivered:
-                    self.stats["channel_deliveries"][channel_name] += 1
-                    success = True
-                    logger.info(f"Delivered to {channel_name}")
-                else:
-                    logger.warning(f"Failed to deliver to {channel_name}")
+                    if delivered:
+                        self.stats["channel_deliveries"][channel_name] += 1
+                        success = True
+                        logger.info(f"Delivered to {channel_name}")
+                    else:
+                        logger.warning(f"Failed to deliver to {channel_name}")
 
-            except Exception as e:
-                logger.error(f"Error delivering to {channel_name}: {e}")
+                except Exception as e:
+                    logger.error(f"Error delivering to {channel_name}: {e}")
 
         return success
 
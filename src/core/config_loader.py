@@ -52,6 +52,7 @@ Error Handling:
     - Type mismatches in values
 """
 
+import functools
 import logging
 import os
 import re
@@ -60,6 +61,12 @@ from typing import Any, Dict, List, Optional
 
 import yaml
 
+# Prefer the LibYAML C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 logger = logging.getLogger(__name__)
 
 
@@ -136,6 +143,35 @@ def expand_env_var(value: Any) -> Any:
     return result
 
 
+@functools.lru_cache(maxsize=32)
+def load_cached_yaml(config_path: str, mtime: float) -> Any:
+    """
+    Parse a YAML file once per file revision.
+
+    The modification time is part of the cache key, so callers pass
+    ``os.path.getmtime(config_path)`` and an edited file is re-parsed on
+    the next call. The returned object is shared between callers and must
+    be treated as read-only.
+
+    Args:
+        config_path: Path to the YAML file
+        mtime: Modification time of config_path (cache key only)
+
+    Returns:
+        Parsed YAML content
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        yaml.YAMLError: If the file is not valid YAML
+
+    Example:
+        >>> path = 'config/cv_config.yaml'
+        >>> config = load_cached_yaml(path, os.path.getmtime(path))
+    """
+    with open(config_path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=YamlSafeLoader)
+
+
 class ConfigurationError(Exception):
     """Raised when configuration is invalid or missing."""
 
@@ -187,7 +223,7 @@ class ConfigLoader:
 
         try:
             with open(config_path, "r", encoding="utf-8") as f:
-                config_data = yaml.safe_load(f)
+                config_data = yaml.load(f, Loader=YamlSafeLoader)
         except yaml.YAMLError as e:
             raise ConfigurationError(f"Invalid YAML in {config_path}: {e}")
 
@@ -322,7 +358,7 @@ def load_config(config_path: str, domain: Optional[str] = None) -> Dict[str, Any
 
     try:
         with open(config_path, "r", encoding="utf-8") as f:
-            config_data = yaml.safe_load(f)
+            config_data = yaml.load(f, Loader=YamlSafeLoader)
     except yaml.YAMLError as e:
         raise ConfigurationError(f"Invalid YAML in {config_path}: {e}")
 
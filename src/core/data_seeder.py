@@ -124,12 +124,14 @@ class DataSeeder:
 
     def _generate_mock_accidents(self, count: int) -> List[Dict[str, Any]]:
         """Generate mock accident entities"""
+        # Formatted once per batch, not once per entity
         timestamp = datetime.utcnow().isoformat() + "Z"
+        id_suffix = datetime.now().strftime("%Y%m%d%H%M%S")
         entities = []
 
         for i in range(count):
             entity = {
-                "id": f"urn:ngsi-ld:Accident:mock-{i}-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+                "id": f"urn:ngsi-ld:Accident:mock-{i}-{id_suffix}",
                 "type": "Accident",
                 "accidentDate": {"type": "Property", "value": timestamp},
                 "location": {
@@ -168,12 +170,14 @@ class DataSeeder:
 
     def _generate_mock_patterns(self, count: int) -> List[Dict[str, Any]]:
         """Generate mock traffic pattern entities"""
+        # Formatted once per batch, not once per entity
         timestamp = datetime.utcnow().isoformat() + "Z"
+        id_suffix = datetime.now().strftime("%Y%m%d%H%M%S")
         entities = []
 
         for i in range(count):
             entity = {
-                "id": f"urn:ngsi-ld:TrafficPattern:mock-{i}-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+                "id": f"urn:ngsi-ld:TrafficPattern:mock-{i}-{id_suffix}",
                 "type": "TrafficPattern",
                 "name": {
                     "type": "Property",
@@ -66,14 +66,14 @@ import logging
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import yaml
 
 from src.core.config_loader import expand_env_var
 
 try:
-    from pymongo import ASCENDING, DESCENDING, GEOSPHERE, MongoClient
+    from pymongo import ASCENDING, DESCENDING, GEOSPHERE, MongoClient, UpdateOne
     from pymongo.errors import (
         BulkWriteError,
         ConnectionFailure,
@@ -85,7 +85,7 @@ try:
 except ImportError:
     PYMONGO_AVAILABLE = False
     MongoClient = None
-    ASCENDING = DESCENDING = GEOSPHERE = None
+    ASCENDING = DESCENDING = GEOSPHERE = UpdateOne = None
     ConnectionFailure = DuplicateKeyError = BulkWriteError = PyMongoError = Exception
 
 # DESCENDING is used for sorting when pymongo is installed
@@ -114,6 +114,8 @@ class MongoDBHelper:
         self.config = self._load_config()
         self.client: Optional[MongoClient] = None
         self.db = None
+        # Collection name -> whether a unique index on "id" exists
+        self._unique_id_index: Dict[str, bool] = {}
         self.enabled = (
             self.config.get("mongodb", {}).get("publishing", {}).get("enabled", True)
         )
@@ -166,10 +168,14 @@ class MongoDBHelper:
             }
         }
 
-    def connect(self) -> bool:
+    def connect(self, event_listeners: Sequence[Any] = ()) -> bool:
         """
         Establish connection to MongoDB.
 
+        Args:
+            event_listeners: pymongo monitoring listeners attached to this
+                helper's client only (e.g. a CommandListener in tests)
+
         Returns:
             True if connection successful, False otherwise
         """
@@ -217,6 +223,7 @@ class MongoDBHelper:
                 socketTimeoutMS=conn_config.get("socket_timeout_ms", 10000),
                 retryWrites=conn_config.get("retry_writes", True),
                 retryReads=conn_config.get("retry_reads", True),
+                event_listeners=list(event_listeners),
             )
 
             # Test connection with retry
@@ -248,6 +255,9 @@ class MongoDBHelper:
         if self.db is None:
             return
 
+        # Index checks made before this point are stale
+        self._unique_id_index.clear()
+
         try:
             index_config = self.config["mongodb"].get("indexes", {})
             collections_config = self.config["mongodb"].get("collections", {})
@@ -268,7 +278,10 @@ class MongoDBHelper:
                             name=idx.get("name"),
                         )
                     except Exception as e:
-                        logger.debug(f"Index already exists or error: {e}")
+                        # Inserts rely on unique indexes to detect existing
+                        # entities, so a failed one is worth a warning
+                        log = logger.warning if idx.get("unique") else logger.debug
+                        log(f"Index {idx.get('name')} on {collection_name} failed: {e}")
 
                 # Create geospatial indexes
                 for idx in geospatial_indexes:
@@ -294,6 +307,44 @@ class MongoDBHelper:
         except Exception as e:
             logger.warning(f"Failed to create indexes: {e}")
 
+    def _has_unique_id_index(self, collection) -> bool:
+        """
+        Whether collection has a unique index on "id" (checked once per name).
+
+        The insert-first write paths rely on that index to reject entities
+        that already exist; without it they must upsert instead.
+        """
+        known = self._unique_id_index.get(collection.name)
+        if known is not None:
+            return known
+
+        try:
+            indexes = collection.index_information()
+        except PyMongoError as e:
+            logger.warning(f"Could not list indexes of {collection.name}: {e}")
+            return False
+
+        known = any(
+            index.get("unique") and index["key"] == [("id", ASCENDING)]
+            for index in indexes.values()
+        )
+        if not known:
+            logger.warning(
+                f"No unique 'id' index on {collection.name}; writes will upsert"
+            )
+        self._unique_id_index[collection.name] = known
+        return known
+
+    @staticmethod
+    def _update_operation(
+        entity: Dict[str, Any], timestamp: datetime, upsert: bool
+    ) -> Dict[str, Any]:
+        """$set update for entity; an upsert also stamps _insertedAt on insert."""
+        update = {"$set": {**entity, "_updatedAt": timestamp}}
+        if upsert:
+            update["$setOnInsert"] = {"_insertedAt": timestamp}
+        return update
+
     def get_collection_name(self, entity_type: str) -> Optional[str]:
         """
         Get MongoDB collection name for NGSI-LD entity type.
@@ -307,12 +358,20 @@ class MongoDBHelper:
         collections = self.config["mongodb"].get("collections", {})
         return collections.get(entity_type)
 
-    def insert_entity(self, entity: Dict[str, Any]) -> bool:
+    def insert_entity(
+        self, entity: Dict[str, Any], collection_name: Optional[str] = None
+    ) -> bool:
         """
-        Insert single NGSI-LD entity to MongoDB.
+        Insert single NGSI-LD entity to MongoDB, updating it if it exists.
+
+        Tries a plain insert and falls back to an update when the unique
+        "id" index reports a duplicate, which is cheaper than an upsert for
+        the common case of new entities. Collections without that index are
+        upserted, since a plain insert there would duplicate the entity.
 
         Args:
             entity: NGSI-LD entity dictionary
+            collection_name: Target collection (default: mapped from entity type)
 
         Returns:
             True if successful, False otherwise
@@ -322,39 +381,51 @@ class MongoDBHelper:
 
         try:
             entity_type = entity.get("type")
-            if not entity_type:
-                logger.warning("Entity missing 'type' field, skipping")
+            if not entity_type or "id" not in entity:
+                logger.warning("Entity missing 'id' or 'type' field, skipping")
                 return False
 
-            collection_name = self.get_collection_name(entity_type)
+            collection_name = collection_name or self.get_collection_name(entity_type)
             if not collection_name:
                 logger.warning(f"No collection mapping for entity type: {entity_type}")
                 return False
 
             collection = self.db[collection_name]
+            timestamp = datetime.utcnow()
 
-            # Add metadata (preserve 100% NGSI-LD data + metadata)
-            entity_with_meta = entity.copy()
-            entity_with_meta["_insertedAt"] = datetime.utcnow()
-            entity_with_meta["_updatedAt"] = datetime.utcnow()
+            if not self._has_unique_id_index(collection):
+                collection.update_one(
+                    {"id": entity["id"]},
+                    self._update_operation(entity, timestamp, upsert=True),
+                    upsert=True,
+                )
+                logger.debug(f"✅ Upserted entity: {entity['id']} to {collection_name}")
+                return True
 
-            # Upsert (update if exists, insert if not)
-            # Use $set to preserve all NGSI-LD fields
+            # Plain insert first (cheapest path for new entities); the unique
+            # index on "id" rejects existing ones, which are then updated.
+            # Copy so insert_one's generated _id does not leak into the caller.
+            try:
+                collection.insert_one(
+                    {**entity, "_insertedAt": timestamp, "_updatedAt": timestamp}
+                )
+                logger.debug(f"✅ Inserted entity: {entity['id']} to {collection_name}")
+                return True
+            except DuplicateKeyError:
+                pass
+
+            # Existing entity: $set all NGSI-LD fields, keep original _insertedAt
             result = collection.update_one(
-                {"id": entity["id"]}, {"$set": entity_with_meta}, upsert=True
+                {"id": entity["id"]},
+                self._update_operation(entity, timestamp, upsert=False),
             )
 
-            if result.upserted_id or result.modified_count > 0:
-                logger.debug(
-                    f"✅ Inserted/Updated entity: {entity['id']} to {collection_name}"
-                )
+            if result.matched_count > 0:
+                logger.debug(f"✅ Updated entity: {entity['id']} in {collection_name}")
                 return True
 
             return False
 
-        except DuplicateKeyError:
-            logger.debug(f"Entity already exists (duplicate key): {entity.get('id')}")
-            return True  # Consider success since entity exists
         except PyMongoError as e:
             logger.error(f"MongoDB insert error: {e}")
             return False
@@ -362,12 +433,27 @@ class MongoDBHelper:
             logger.error(f"Unexpected error inserting entity: {e}")
             return False
 
-    def insert_entities_batch(self, entities: List[Dict[str, Any]]) -> Tuple[int, int]:
+    def insert_entities_batch(
+        self,
+        entities: List[Dict[str, Any]],
+        collection_name: Optional[str] = None,
+        ordered: bool = False,
+    ) -> Tuple[int, int]:
         """
-        Batch insert NGSI-LD entities to MongoDB.
+        Batch upsert NGSI-LD entities to MongoDB.
+
+        Entities are grouped by target collection. Within a group, new
+        entities are written with one insert_many and existing ones with one
+        bulk_write of $set updates, so a batch costs a few round trips per
+        collection instead of one per entity, and new entities skip the
+        server-side upsert match/diff. Collections without a unique "id"
+        index are written with one bulk_write of upserts instead.
 
         Args:
             entities: List of NGSI-LD entity dictionaries
+            collection_name: Target collection for all entities (default:
+                mapped from each entity's type)
+            ordered: Stop at the first write error instead of continuing
 
         Returns:
             Tuple of (successful_count, failed_count)
@@ -375,78 +461,141 @@ class MongoDBHelper:
         if not self.enabled or self.db is None or not entities:
             return 0, 0
 
-        # Group entities by type
-        entities_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        success_count = 0
+        fail_count = 0
+
+        # Group entities by target collection
+        entities_by_collection: Dict[str, List[Dict[str, Any]]] = {}
         for entity in entities:
             entity_type = entity.get("type")
-            if not entity_type:
+            if not entity_type or "id" not in entity:
+                logger.warning("Entity missing 'id' or 'type' field, skipping")
+                fail_count += 1
                 continue
 
-            if entity_type not in entities_by_type:
-                entities_by_type[entity_type] = []
-            entities_by_type[entity_type].append(entity)
+            target = collection_name or self.get_collection_name(entity_type)
+            if not target:
+                logger.warning(f"No collection mapping for entity type: {entity_type}")
+                fail_count += 1
+                continue
 
-        success_count = 0
-        fail_count = 0
+            entities_by_collection.setdefault(target, []).append(entity)
 
-        # Insert per entity type
-        for entity_type, type_entities in entities_by_type.items():
-            collection_name = self.get_collection_name(entity_type)
-            if not collection_name:
-                fail_count += len(type_entities)
-                continue
+        timestamp = datetime.utcnow()
 
-            collection = self.db[collection_name]
+        for target, group in entities_by_collection.items():
+            collection = self.db[target]
+            upsert = not self._has_unique_id_index(collection)
+            if upsert:
+                # No unique index to reject existing ids: upsert the group
+                inserted, to_update, failed = 0, group, 0
+            else:
+                inserted, to_update, failed = self._insert_new_entities(
+                    collection, group, timestamp
+                )
+            success_count += inserted
+            fail_count += failed
 
-            # Add metadata (preserve 100% NGSI-LD data + metadata)
-            entities_with_meta = []
-            timestamp = datetime.utcnow()
-            for entity in type_entities:
-                entity_with_meta = entity.copy()
-                entity_with_meta["_insertedAt"] = timestamp
-                entity_with_meta["_updatedAt"] = timestamp
-                entities_with_meta.append(entity_with_meta)
+            if not to_update:
+                logger.info(f"✅ Batch inserted {inserted} entities to {target}")
+                continue
 
-            try:
-                # Bulk write with upsert - preserve all NGSI-LD fields
-                from pymongo import UpdateOne
-
-                operations = [
-                    UpdateOne(
-                        {"id": entity_with_meta["id"]},
-                        {"$set": entity_with_meta},
-                        upsert=True,
-                    )
-                    for entity_with_meta in entities_with_meta
-                ]
+            # Existing entities: $set all NGSI-LD fields, keep original _insertedAt
+            operations = [
+                UpdateOne(
+                    {"id": entity["id"]},
+                    self._update_operation(entity, timestamp, upsert),
+                    upsert=upsert,
+                )
+                for entity in to_update
+            ]
 
-                result = collection.bulk_write(operations, ordered=False)
+            try:
+                result = collection.bulk_write(operations, ordered=ordered)
 
-                inserted = result.upserted_count + result.modified_count
-                success_count += inserted
+                inserted += result.upserted_count
+                success_count += result.matched_count + result.upserted_count
 
                 logger.info(
-                    f"✅ Batch inserted {inserted} {entity_type} entities to {collection_name}"
+                    f"✅ Batch wrote {inserted + result.matched_count} entities to "
+                    f"{target} ({inserted} inserted, {result.matched_count} updated)"
                 )
 
             except BulkWriteError as bwe:
                 # Partial success
-                success_count += bwe.details.get("nInserted", 0) + bwe.details.get(
-                    "nModified", 0
+                success_count += bwe.details.get("nMatched", 0) + bwe.details.get(
+                    "nUpserted", 0
                 )
                 fail_count += len(bwe.details.get("writeErrors", []))
                 logger.warning(f"Bulk write partial failure: {bwe.details}")
             except PyMongoError as e:
-                fail_count += len(type_entities)
-                logger.error(f"MongoDB batch insert error: {e}")
+                fail_count += len(to_update)
+                logger.error(f"MongoDB batch update error: {e}")
             except Exception as e:
-                fail_count += len(type_entities)
-                logger.error(f"Unexpected batch insert error: {e}")
+                fail_count += len(to_update)
+                logger.error(f"Unexpected batch update error: {e}")
 
         return success_count, fail_count
 
+    def _insert_new_entities(
+        self, collection, entities: List[Dict[str, Any]], timestamp: datetime
+    ) -> Tuple[int, List[Dict[str, Any]], int]:
+        """
+        Insert the entities of one collection that do not exist yet.
+
+        One find() on the "id" index splits the group into new and existing
+        entities; new ones go out in a single unordered insert_many. Entities
+        that turn out to exist (already stored, or inserted concurrently and
+        rejected by the unique index) are returned for the update path.
+
+        Returns:
+            Tuple of (inserted_count, entities_to_update, failed_count)
+        """
+        try:
+            existing_ids = {
+                doc["id"]
+                for doc in collection.find(
+                    {"id": {"$in": [entity["id"] for entity in entities]}},
+                    {"_id": 0, "id": 1},
+                )
+            }
+        except PyMongoError as e:
+            logger.error(f"MongoDB batch lookup error: {e}")
+            return 0, [], len(entities)
+
+        to_insert = [e for e in entities if e["id"] not in existing_ids]
+        to_update = [e for e in entities if e["id"] in existing_ids]
+        if not to_insert:
+            return 0, to_update, 0
+
+        documents = [
+            {**entity, "_insertedAt": timestamp, "_updatedAt": timestamp}
+            for entity in to_insert
+        ]
+
+        try:
+            result = collection.insert_many(documents, ordered=False)
+            return len(result.inserted_ids), to_update, 0
+
+        except BulkWriteError as bwe:
+            failed = 0
+            for error in bwe.details.get("writeErrors", []):
+                if error.get("code") == 11000:  # duplicate key
+                    to_update.append(to_insert[error["index"]])
+                else:
+                    failed += 1
+            if failed:
+                logger.warning(f"Bulk insert partial failure: {bwe.details}")
+            return bwe.details.get("nInserted", 0), to_update, failed
+        except PyMongoError as e:
+            logger.error(f"MongoDB batch insert error: {e}")
+            return 0, to_update, len(to_insert)
+
     def find_entity(
-        self, entity_id: str, entity_type: Optional[str] = None
+        self,
+        entity_id: str,
+        entity_type: Optional[str] = None,
+        collection_name: Optional[str] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Find entity by ID.
@@ -454,6 +603,7 @@ class MongoDBHelper:
         Args:
             entity_id: NGSI-LD entity ID
             entity_type: Optional entity type for faster lookup
+            collection_name: Optional collection to search directly
 
         Returns:
             Entity dictionary or None if not found
@@ -462,6 +612,11 @@ class MongoDBHelper:
             return None
 
         try:
+            if collection_name:
+                return self.db[collection_name].find_one(
+                    {"id": entity_id}, {"_id": 0, "_insertedAt": 0}
+                )
+
             # If entity type provided, search specific collection
             if entity_type:
                 collection_name = self.get_collection_name(entity_type)
@@ -487,6 +642,51 @@ class MongoDBHelper:
             logger.error(f"MongoDB find error: {e}")
             return None
 
+    def find_entities(
+        self,
+        entity_ids: List[str],
+        entity_type: Optional[str] = None,
+        collection_name: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find several entities by ID in one query per collection.
+
+        Uses a single $in match on the "id" index instead of one find_one()
+        round trip per entity. Documents come back in index order, not in
+        the order of entity_ids; IDs that are not stored are simply absent.
+
+        Args:
+            entity_ids: NGSI-LD entity IDs
+            entity_type: Optional entity type for faster lookup
+            collection_name: Optional collection to search directly
+
+        Returns:
+            List of entity dictionaries found
+        """
+        if not self.enabled or self.db is None or not entity_ids:
+            return []
+
+        if entity_type and not collection_name:
+            collection_name = self.get_collection_name(entity_type)
+
+        if collection_name:
+            collection_names = [collection_name]
+        else:
+            # Otherwise search all collections
+            collections_config = self.config["mongodb"].get("collections", {})
+            collection_names = list(collections_config.values())
+
+        query = {"id": {"$in": list(entity_ids)}}
+        try:
+            found = []
+            for name in collection_names:
+                found.extend(self.db[name].find(query, {"_id": 0, "_insertedAt": 0}))
+            return found
+
+        except PyMongoError as e:
+            logger.error(f"MongoDB find error: {e}")
+            return []
+
     def find_near_location(
         self,
         entity_type: str,
@@ -494,16 +694,22 @@ class MongoDBHelper:
         latitude: float,
         max_distance_meters: int = 1000,
         limit: int = 10,
+        collection_name: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Find entities near a geographic location.
 
+        Requires a 2dsphere index on location.value (created by connect()
+        for mapped collections); results come back in distance order from
+        the index, so no sort is applied.
+
         Args:
             entity_type: NGSI-LD entity type
             longitude: Longitude (WGS84)
             latitude: Latitude (WGS84)
             max_distance_meters: Maximum distance in meters
             limit: Maximum number of results
+            collection_name: Collection to query (default: mapped from entity_type)
 
         Returns:
             List of entities sorted by distance
@@ -512,16 +718,16 @@ class MongoDBHelper:
             return []
 
         try:
-            collection_name = self.get_collection_name(entity_type)
+            collection_name = collection_name or self.get_collection_name(entity_type)
             if not collection_name:
                 return []
 
             collection = self.db[collection_name]
 
-            # GeoJSON Point
+            # GeoJSON Point on a spherical 2dsphere index
             query = {
                 "location.value": {
-                    "$near": {
+                    "$nearSphere": {
                         "$geometry": {
                             "type": "Point",
                             "coordinates": [longitude, latitude],
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Shared CV Agent Server.
+
+UIP - Urban Intelligence Platform
+Copyright (c) 2025 UIP Team. All rights reserved.
+https://github.com/UIP-Urban-Intelligence-Platform/UIP-Urban_Intelligence_Platform
+
+SPDX-License-Identifier: MIT
+
+Module: tests._cv_agent_server
+Author: Nguyen Dinh Anh Tuan
+Created: 2025-12-08
+Version: 1.0.0
+License: MIT
+
+Description:
+    Keeps one CVAnalysisAgent, with its detection models loaded, alive in a
+    background process behind a multiprocessing BaseManager. The live
+    citizen workflow scripts call process_citizen_reports() on it over the
+    manager connection, so the model load is paid once per server instead
+    of once per script run. Scripts fall back to an in-process agent when
+    the server is not running.
+
+    The manager unpickles every call it receives, so anyone holding the
+    authkey can run code in the server. Set CV_AGENT_AUTHKEY to a private
+    value for both the server and the scripts; the b"cv" default is only
+    meant for a single-user machine.
+
+Usage:
+    CV_AGENT_AUTHKEY=... python tests/_cv_agent_server.py   # Serve until Ctrl+C
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.managers import BaseManager
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CV_CONFIG_PATH = PROJECT_ROOT / "config" / "cv_config.yaml"
+
+ADDRESS = ("127.0.0.1", 50555)
+# Fallback only; override with the CV_AGENT_AUTHKEY environment variable
+DEFAULT_AUTHKEY = b"cv"
+
+
+def _authkey() -> bytes:
+    """Manager authkey shared by server and clients."""
+    authkey = os.environ.get("CV_AGENT_AUTHKEY")
+    return authkey.encode("utf-8") if authkey else DEFAULT_AUTHKEY
+
+
+class CVAgentManager(BaseManager):
+    """Manager exposing the shared agent as the "cv_agent" typeid."""
+
+
+# Client side: the proxy type is created on demand by the server
+CVAgentManager.register("cv_agent")
+
+
+class CVAgentService:
+    """Server-side wrapper running the async agent on a private event loop."""
+
+    def __init__(self):
+        sys.path.insert(0, str(PROJECT_ROOT))
+        from src.agents.analytics.cv_analysis_agent import CVAnalysisAgent
+
+        self.agent = CVAnalysisAgent(str(CV_CONFIG_PATH))
+        self.loop = asyncio.new_event_loop()
+        # Manager connections are served on separate threads; one loop run at a time
+        self.lock = threading.Lock()
+
+    def process_citizen_reports(self) -> int:
+        """Verify pending citizen reports; returns the number processed."""
+        with self.lock:
+            return self.loop.run_until_complete(self.agent.process_citizen_reports())
+
+
+def connect():
+    """Return a proxy to the running server's agent, or None if unreachable."""
+    manager = CVAgentManager(address=ADDRESS, authkey=_authkey())
+    try:
+        manager.connect()
+    except (OSError, AuthenticationError):
+        # Not running, or started with a different CV_AGENT_AUTHKEY
+        return None
+    return manager.cv_agent()
+
+
+def serve() -> None:
+    """Load the agent once and serve it until interrupted."""
+    service = CVAgentService()
+    CVAgentManager.register("cv_agent", callable=lambda: service)
+    server = CVAgentManager(address=ADDRESS, authkey=_authkey()).get_server()
+    print(f"✅ CV Agent ready on {ADDRESS[0]}:{ADDRESS[1]}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Cached Observation Loader.
+
+UIP - Urban Intelligence Platform
+Copyright (c) 2025 UIP Team. All rights reserved.
+https://github.com/UIP-Urban-Intelligence-Platform/UIP-Urban_Intelligence_Platform
+
+SPDX-License-Identifier: MIT
+
+Module: tests._observations
+Author: Nguyen Dinh Anh Tuan
+Created: 2025-12-08
+Version: 1.0.0
+License: MIT
+
+Description:
+    Parses data/observations.json once per process and file revision for
+    the congestion debug script. The file is memory-mapped and decoded
+    with orjson; the parsed list is memoized on (path, mtime), so repeated
+    loads in one process share one parse and an edited file is re-read.
+    test_congestion_full streams the file through the agent instead, since
+    with --dist=loadfile the two scripts may run on different workers.
+
+Usage:
+    from tests._observations import load_observations
+
+    observations = load_observations()  # Shared list - do not mutate
+"""
+
+import functools
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import orjson
+
+OBSERVATIONS_PATH = Path("data/observations.json")
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_observations(path: str, mtime: float) -> List[Dict[str, Any]]:
+    """Parse path straight from its mapping (mtime is the cache key only)."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def load_observations(path=OBSERVATIONS_PATH) -> List[Dict[str, Any]]:
+    """Parsed observations of path, shared until the file changes."""
+    return _parse_observations(str(path), os.path.getmtime(path))
@@ -35,6 +35,15 @@ from typing import Any, Dict
 import pytest
 import yaml
 
+# uvloop ships with uvicorn[standard]; not available on Windows
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+    uvloop = None
+
 
 # Python 3.9 compatibility: ensure event loop exists for asyncio.Event()
 @pytest.fixture(scope="session", autouse=True)
@@ -56,6 +65,21 @@ def setup_event_loop_for_session():
     yield loop
 
 
+# optionalhook: the hookspec only exists from pytest-asyncio 1.4 onwards
+@pytest.hookimpl(optionalhook=True)
+def pytest_asyncio_loop_factories(config, item):
+    """
+    Run async tests on uvloop when it is installed.
+
+    The ingestion, workflow and CV verification tests schedule many
+    coroutines; uvloop lowers the per-await overhead of the default loop.
+    A single factory keeps test ids unchanged.
+    """
+    if UVLOOP_AVAILABLE:
+        return {"uvloop": uvloop.new_event_loop}
+    return {"asyncio": asyncio.new_event_loop}
+
+
 @pytest.fixture(scope="session")
 def project_root() -> Path:
     """Get project root directory."""
@@ -169,3 +193,6 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "requires_docker: Tests requiring Docker services"
     )
+    config.addinivalue_line(
+        "markers", "network: Tests calling a live local server (deselected by default)"
+    )
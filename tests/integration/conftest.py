@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Integration Test Fixtures.
+
+UIP - Urban Intelligence Platform
+Copyright (c) 2025 UIP Team. All rights reserved.
+https://github.com/UIP-Urban-Intelligence-Platform/UIP-Urban_Intelligence_Platform
+
+SPDX-License-Identifier: MIT
+
+Module: tests.integration.conftest
+Author: Nguyen Nhat Quang
+Created: 2025-12-08
+Version: 1.0.0
+License: MIT
+
+Description:
+    Session-scoped connections to the external services used by the
+    integration suites (MongoDB, Neo4j, Stellio). Each connection is opened
+    once per pytest session (per xdist worker) instead of once per test, so
+    TCP/TLS/auth handshakes are paid a single time. Per-test isolation comes
+    from cleanup fixtures rather than fresh connections.
+
+    Under pytest-xdist every worker gets its own Mongo database and id
+    prefix, so suites can run in parallel against the same services.
+
+    Fixtures include:
+    - test_id_prefix: Per-worker id prefix for created nodes/entities
+    - mongo_helper: MongoDBHelper on a per-worker test database
+    - mongo_indexes: Indexes required by the Mongo suites, created once
+    - redis_available: Whether a Redis server answers PING, probed once
+    - neo4j_driver / clean_neo4j: Shared Bolt driver, TEST-prefixed nodes removed
+    - http_client / clean_stellio: Shared HTTP/2 Stellio client, created entities
+      batch-deleted at session end
+    - smtp_sink: In-process aiosmtpd server recording delivered messages
+    - webhook_router: respx router answering the test webhook endpoint
+
+Usage:
+    Automatically loaded by pytest for tests/integration.
+"""
+
+import logging
+import os
+import socket
+from typing import Any, Iterator
+
+import pytest
+import pytest_asyncio
+
+# pytest-xdist worker id ("gw0", "gw1", ...); empty when running serially
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "")
+
+# Marker in the id of every entity/node the integration suites create;
+# includes the worker id so parallel workers only clean up their own data
+TEST_ID_PREFIX = f"TEST-{XDIST_WORKER}-" if XDIST_WORKER else "TEST-"
+
+logger = logging.getLogger(__name__)
+
+STELLIO_URL = os.environ.get("STELLIO_URL", "http://localhost:8080") + "/ngsi-ld/v1"
+
+
+@pytest.fixture(scope="session")
+def test_id_prefix() -> str:
+    """Prefix for ids of nodes/entities created by a test (per xdist worker)."""
+    return TEST_ID_PREFIX
+
+
+# ============================================================================
+# MongoDB
+# ============================================================================
+
+
+@pytest.fixture(scope="session")
+def mongo_helper() -> Iterator[Any]:
+    """
+    Connected MongoDBHelper shared by the whole session.
+
+    Uses "<database>_test<worker>" so tests never touch the real entity
+    database and parallel xdist workers do not collide. The helper is also
+    installed as the get_mongodb_helper() singleton for code under test.
+    """
+    from src.utils import mongodb_helper as mongodb_module
+
+    if not mongodb_module.PYMONGO_AVAILABLE:
+        pytest.skip("pymongo not installed")
+
+    helper = mongodb_module.MongoDBHelper()
+    database = helper.config["mongodb"]["database"]
+    database["name"] = f"{database['name']}_test{XDIST_WORKER}"
+
+    if not helper.enabled or not helper.connect():
+        pytest.skip("MongoDB not available")
+
+    mongodb_module._mongodb_helper = helper
+    yield helper
+
+    helper.client.drop_database(database["name"])
+    helper.close()
+    mongodb_module._mongodb_helper = None
+
+
+# (collection, key spec, create_index options) needed by the Mongo suites:
+# unique "id" for insert-then-update, 2dsphere for $nearSphere queries
+REQUIRED_INDEXES = [
+    ("test_entities", [("id", 1)], {"unique": True}),
+    ("test_entities", [("type", 1)], {}),
+    ("test_entities", [("location.value", "2dsphere")], {}),
+    ("test_entities_upsert", [("id", 1)], {"unique": True}),
+]
+
+
+@pytest.fixture(scope="session")
+def mongo_indexes(mongo_helper) -> Any:
+    """
+    Create REQUIRED_INDEXES once per session, skipping ones that exist.
+
+    Existing indexes are read with a single list_indexes() per collection,
+    so no createIndex is sent for an index that is already built.
+    """
+    existing = {}
+    for collection_name, keys, options in REQUIRED_INDEXES:
+        collection = mongo_helper.db[collection_name]
+        if collection_name not in existing:
+            existing[collection_name] = [
+                list(index["key"].items()) for index in collection.list_indexes()
+            ]
+        if keys not in existing[collection_name]:
+            collection.create_index(keys, **options)
+            existing[collection_name].append(keys)
+            logger.info(f"Created index {keys} on {collection_name}")
+    return mongo_helper
+
+
+# ============================================================================
+# Redis
+# ============================================================================
+
+REDIS_HOST = os.environ.get("REDIS_HOST", "localhost")
+REDIS_PORT = int(os.environ.get("REDIS_PORT", "6379"))
+
+
+@pytest.fixture(scope="session")
+def redis_available() -> bool:
+    """
+    Whether a Redis server answers PING, probed once per session.
+
+    The probe uses a 100 ms connect timeout, so suites without a server
+    skip immediately instead of each test waiting on a refused connection.
+    """
+    try:
+        import redis
+    except ImportError:
+        return False
+
+    client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, socket_connect_timeout=0.1)
+    try:
+        return bool(client.ping())
+    except (redis.RedisError, OSError):
+        return False
+    finally:
+        client.close()
+
+
+# ============================================================================
+# Neo4j
+# ============================================================================
+
+
+@pytest.fixture(scope="session")
+def neo4j_driver() -> Iterator[Any]:
+    """Neo4j driver shared by the whole session."""
+    from neo4j import GraphDatabase
+
+    driver = GraphDatabase.driver("bolt://localhost:7687", auth=("neo4j", "password"))
+    yield driver
+    driver.close()
+
+
+@pytest.fixture
+def clean_neo4j(neo4j_driver) -> Iterator[Any]:
+    """Delete nodes created by the test (id starting with TEST_ID_PREFIX)."""
+    yield neo4j_driver
+    with neo4j_driver.session() as session:
+        session.run(
+            "MATCH (n) WHERE n.id STARTS WITH $prefix DETACH DELETE n",
+            prefix=TEST_ID_PREFIX,
+        )
+
+
+# ============================================================================
+# Stellio
+# ============================================================================
+
+
+@pytest.fixture(scope="session")
+def stellio_url() -> str:
+    """Stellio NGSI-LD API base URL."""
+    return STELLIO_URL
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def http_client(stellio_url: str):
+    """
+    HTTP/2 client for Stellio shared by the whole session.
+
+    Requests use paths relative to stellio_url and are multiplexed over
+    one pooled connection.
+    """
+    import httpx
+
+    async with httpx.AsyncClient(
+        base_url=stellio_url,
+        timeout=30.0,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=100),
+    ) as client:
+        yield client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def clean_stellio(http_client):
+    """
+    Collect ids of entities created during the session; delete at the end.
+
+    All ids go out in one NGSI-LD batch delete when the session finishes,
+    so tests pay no per-test teardown round trip. Only ids containing
+    TEST_ID_PREFIX are deleted, as a guard against removing real entities.
+    """
+    created = []
+    yield created
+
+    entity_ids = [entity_id for entity_id in created if TEST_ID_PREFIX in entity_id]
+    if entity_ids:
+        await http_client.post(
+            "/entityOperations/delete",
+            json=entity_ids,
+            headers={"Content-Type": "application/json"},
+        )
+
+
+# ============================================================================
+# Notifications (SMTP / webhook)
+# ============================================================================
+
+WEBHOOK_BASE_URL = "http://example.com"
+
+
+def _free_port(host: str) -> int:
+    """Reserve an ephemeral port (aiosmtpd's Controller cannot bind port 0)."""
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="session")
+def smtp_sink() -> Iterator[Any]:
+    """
+    SMTP server running in-process for the whole session.
+
+    Tests send through a real smtplib.SMTP(smtp_sink.hostname, smtp_sink.port)
+    and assert on smtp_sink.messages (email.message.Message objects).
+    """
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+    handlers_module = pytest.importorskip("aiosmtpd.handlers")
+
+    class RecordingHandler(handlers_module.Message):
+        def __init__(self):
+            super().__init__()
+            self.messages = []
+
+        def handle_message(self, message):
+            self.messages.append(message)
+
+    hostname = "127.0.0.1"
+    handler = RecordingHandler()
+    controller = controller_module.Controller(
+        handler, hostname=hostname, port=_free_port(hostname)
+    )
+    controller.start()
+    controller.messages = handler.messages
+    yield controller
+    controller.stop()
+
+
+@pytest.fixture
+def webhook_router() -> Iterator[Any]:
+    """respx router accepting POST /webhook on WEBHOOK_BASE_URL."""
+    respx = pytest.importorskip("respx")
+
+    with respx.mock(base_url=WEBHOOK_BASE_URL) as router:
+        router.post("/webhook", name="webhook").respond(
+            200, json={"status": "received"}
+        )
+        yield router
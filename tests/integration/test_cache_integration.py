@@ -48,11 +48,21 @@ class TestCacheIntegration:
     """Test Redis cache integration."""
 
     @pytest.fixture
-    def redis_client(self):
-        """Create Redis client."""
-        client = redis.Redis(host="localhost", port=6379, db=0, decode_responses=True)
+    def redis_client(self, redis_available):
+        """Create Redis client backed by a blocking connection pool."""
+        if not redis_available:
+            pytest.skip("Redis server not reachable")
+        pool = redis.BlockingConnectionPool(
+            host="localhost",
+            port=6379,
+            db=0,
+            decode_responses=True,
+            max_connections=50,
+        )
+        client = redis.Redis(connection_pool=pool)
         yield client
         client.close()
+        pool.disconnect()
 
     def test_redis_connection(self, redis_client):
         """Test Redis connection and basic operations."""
@@ -69,21 +79,30 @@ class TestCacheIntegration:
 
     def test_cache_invalidation_cascade(self, redis_client):
         """Test cache invalidation with dependent keys."""
-        # Set up dependent cache entries
-        redis_client.set("camera:CAM001", '{"id": "CAM001"}')
-        redis_client.set("camera:CAM001:observations", "[1,2,3]")
-        redis_client.set("camera:CAM001:stats", '{"count": 3}')
+        index_key = "idx:camera:CAM001"
+        dependent = {
+            "camera:CAM001": '{"id": "CAM001"}',
+            "camera:CAM001:observations": "[1,2,3]",
+            "camera:CAM001:stats": '{"count": 3}',
+        }
 
-        # Invalidate using pattern
-        pattern = "camera:CAM001*"
-        keys = list(redis_client.scan_iter(match=pattern))
+        # Set up dependent cache entries and register them in the index set
+        # in a single round trip
+        pipe = redis_client.pipeline()
+        for key, value in dependent.items():
+            pipe.set(key, value)
+            pipe.sadd(index_key, key)
+        pipe.execute()
 
-        assert len(keys) >= 3
+        # Invalidate via the index set: one O(k) read instead of a keyspace SCAN
+        keys = redis_client.smembers(index_key)
 
-        # Delete all matching keys
-        if keys:
-            redis_client.delete(*keys)
+        assert keys == set(dependent)
+
+        # UNLINK frees memory asynchronously on the server
+        redis_client.unlink(*keys, index_key)
 
         # Verify deletion
         assert redis_client.get("camera:CAM001") is None
         assert redis_client.get("camera:CAM001:observations") is None
+        assert redis_client.exists(index_key) == 0
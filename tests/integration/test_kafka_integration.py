@@ -24,10 +24,34 @@ Usage:
 """
 
 import json
+import timeit
 from unittest.mock import Mock, patch
 
 import pytest
 
+# orjson is pinned in requirements/test.txt; stdlib json keeps the suite usable
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(obj) -> bytes:
+    """Encode a Kafka message value as UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(value: bytes):
+    """Decode a Kafka message value."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(value)
+    return json.loads(value.decode("utf-8"))
+
 
 @pytest.mark.integration
 @pytest.mark.requires_docker
@@ -51,7 +75,7 @@ class TestKafkaIntegration:
         test_message = {"camera_id": "CAM001", "vehicles": 15}
         consumer_instance = Mock()
         consumer_instance.__iter__ = Mock(
-            return_value=iter([Mock(value=json.dumps(test_message).encode("utf-8"))])
+            return_value=iter([Mock(value=_dumps(test_message))])
         )
         mock_consumer.return_value = consumer_instance
 
@@ -59,7 +83,7 @@ class TestKafkaIntegration:
         from kafka import KafkaProducer
 
         producer = KafkaProducer(bootstrap_servers=kafka_config["bootstrap_servers"])
-        producer.send(kafka_config["topic"], json.dumps(test_message).encode("utf-8"))
+        producer.send(kafka_config["topic"], _dumps(test_message))
 
         # Consume message
         from kafka import KafkaConsumer
@@ -70,7 +94,30 @@ class TestKafkaIntegration:
 
         # Verify message received
         for message in consumer:
-            received = json.loads(message.value.decode("utf-8"))
+            received = _loads(message.value)
             assert received["camera_id"] == "CAM001"
             assert received["vehicles"] == 15
             break
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not ORJSON_AVAILABLE, reason="orjson not installed")
+@pytest.mark.parametrize("payload_bytes", [100, 10_000, 1_000_000])
+def test_orjson_faster_than_json_roundtrip(payload_bytes):
+    """Compare per-message encode/decode cost of orjson and stdlib json."""
+    record = {"camera_id": "CAM001", "vehicles": 15, "speed": 23.5}
+    record_size = len(orjson.dumps(record)) + 1
+    payload = {"observations": [record] * max(1, payload_bytes // record_size)}
+
+    def json_roundtrip():
+        json.loads(json.dumps(payload).encode("utf-8").decode("utf-8"))
+
+    def orjson_roundtrip():
+        orjson.loads(orjson.dumps(payload))
+
+    number = max(1, 100_000 // payload_bytes)
+    json_time = min(timeit.repeat(json_roundtrip, number=number, repeat=3))
+    orjson_time = min(timeit.repeat(orjson_roundtrip, number=number, repeat=3))
+
+    assert orjson.loads(orjson.dumps(payload)) == payload
+    assert orjson_time < json_time
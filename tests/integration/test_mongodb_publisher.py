@@ -28,190 +28,374 @@ Usage:
     pytest tests/integration/test_mongodb_publisher.py
 """
 
+import copy
 import os
+import re
 import sys
-import unittest
+import time
+import uuid
 from datetime import datetime
 from typing import Any, Dict
 
+import pytest
+
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 try:
-    from src.utils.mongodb_helper import get_mongodb_helper
+    from pymongo import UpdateOne, monitoring
+
+    from src.utils.mongodb_helper import MongoDBHelper, get_mongodb_helper
 
     MONGODB_AVAILABLE = True
 except ImportError:
     MONGODB_AVAILABLE = False
 
+# Test collection names
+TEST_COLLECTION = "test_entities"
+UPSERT_COLLECTION = "test_entities_upsert"
 
-@unittest.skipIf(not MONGODB_AVAILABLE, "MongoDB helper not available")
-class TestMongoDBPublisher(unittest.TestCase):
-    """Test suite for MongoDB publishing integration"""
+if MONGODB_AVAILABLE:
 
-    @classmethod
-    def setUpClass(cls):
-        """Set up test environment"""
-        cls.helper = get_mongodb_helper()
-        if not cls.helper or not cls.helper.enabled:
-            raise unittest.SkipTest("MongoDB not configured or not available")
-
-        # Test collection name
-        cls.test_collection = "test_entities"
-
-    def tearDown(self):
-        """Clean up test data after each test"""
-        if self.helper and self.helper.enabled:
-            try:
-                db = self.helper._client[self.helper._db_name]
-                db[self.test_collection].delete_many({})
-            except Exception:
-                # Cleanup failure is acceptable in tests - next test will handle it
-                pass
-
-    def _create_test_entity(
-        self, entity_id: str, entity_type: str = "TestEntity"
-    ) -> Dict[str, Any]:
-        """Create a test NGSI-LD entity"""
-        return {
-            "id": entity_id,
-            "type": entity_type,
-            "@context": ["https://uri.etsi.org/ngsi-ld/v1/ngsi-ld-core-context.jsonld"],
-            "testProperty": {
-                "type": "Property",
-                "value": "test value",
-                "observedAt": datetime.utcnow().isoformat() + "Z",
-            },
-            "location": {
-                "type": "GeoProperty",
-                "value": {
-                    "type": "Point",
-                    "coordinates": [105.8342, 21.0278],  # Hanoi coordinates
-                },
+    class _CommandRecorder(monitoring.CommandListener):
+        """Record (command name, collection) of commands started while enabled"""
+
+        def __init__(self):
+            self.recording = False
+            self.commands = []
+
+        def started(self, event):
+            if self.recording:
+                collection = event.command.get(event.command_name)
+                self.commands.append((event.command_name, collection))
+
+        def succeeded(self, event):
+            pass
+
+        def failed(self, event):
+            pass
+
+
+@pytest.fixture(scope="module")
+def helper(mongo_indexes):
+    """Session MongoDB helper with the test collections' indexes built"""
+    return mongo_indexes
+
+
+# Collection handles are resolved once per module; each db[...] lookup
+# builds a new Collection wrapper
+@pytest.fixture(scope="module")
+def collection(helper):
+    """Handle on the test collection"""
+    return helper.db[TEST_COLLECTION]
+
+
+@pytest.fixture(scope="module")
+def upsert_collection(helper):
+    """Handle on the collection used as the plain-upsert baseline"""
+    return helper.db[UPSERT_COLLECTION]
+
+
+@pytest.fixture(scope="module")
+def camera_collection(helper):
+    """Handle on the collection mapped to the Camera entity type"""
+    return helper.db[helper.get_collection_name("Camera")]
+
+
+# Batch tests never inspect observedAt, so one timestamp serves the module
+_OBSERVED_AT = datetime.utcnow().isoformat() + "Z"
+
+
+@pytest.fixture(scope="module")
+def entity_template() -> Dict[str, Any]:
+    """Sample NGSI-LD entity built once per module; tests rewrite ``id``"""
+    return {
+        "id": "urn:ngsi-ld:TestEntity:template",
+        "type": "TestEntity",
+        "@context": ["https://uri.etsi.org/ngsi-ld/v1/ngsi-ld-core-context.jsonld"],
+        "testProperty": {
+            "type": "Property",
+            "value": "test value",
+            "observedAt": _OBSERVED_AT,
+        },
+        "location": {
+            "type": "GeoProperty",
+            "value": {
+                "type": "Point",
+                "coordinates": [105.8342, 21.0278],  # Hanoi coordinates
             },
-        }
+        },
+    }
+
+
+@pytest.fixture
+def id_prefix(collection, upsert_collection, camera_collection):
+    """
+    Unique id prefix for the entities a test creates.
+
+    Teardown deletes only ids with this prefix; the anchored regex is
+    served from the unique "id" index instead of scanning the collection.
+    """
+    prefix = f"urn:ngsi-ld:TestEntity:{uuid.uuid4().hex[:8]}:"
+    yield prefix
+
+    query = _id_filter(prefix)
+    for handle in (collection, upsert_collection, camera_collection):
+        handle.delete_many(query)
+
+
+def _id_filter(prefix: str) -> Dict[str, Any]:
+    """Query matching entity ids starting with prefix"""
+    return {"id": {"$regex": f"^{re.escape(prefix)}"}}
+
+
+def _mutable_entity(template: Dict[str, Any], entity_id: str) -> Dict[str, Any]:
+    """Deep copy of the template for tests that modify nested properties"""
+    entity = copy.deepcopy(template)
+    entity["id"] = entity_id
+    return entity
 
-    def test_connection_initialized(self):
+
+@pytest.mark.skipif(not MONGODB_AVAILABLE, reason="MongoDB helper not available")
+class TestMongoDBPublisher:
+    """Test suite for MongoDB publishing integration"""
+
+    def test_connection_initialized(self, helper):
         """Test that MongoDB connection is properly initialized"""
-        self.assertIsNotNone(self.helper)
-        self.assertTrue(self.helper.enabled)
-        self.assertIsNotNone(self.helper._client)
+        assert helper is not None
+        assert helper.enabled
+        assert helper.client is not None
 
-    def test_insert_single_entity(self):
+    def test_insert_single_entity(self, helper, entity_template, collection, id_prefix):
         """Test inserting a single entity"""
-        entity = self._create_test_entity("urn:ngsi-ld:TestEntity:001")
+        entity = {**entity_template, "id": f"{id_prefix}001"}
 
         # Insert entity
-        result = self.helper.insert_entity(entity, collection_name=self.test_collection)
-        self.assertTrue(result, "Entity insertion should succeed")
+        result = helper.insert_entity(entity, collection_name=TEST_COLLECTION)
+        assert result, "Entity insertion should succeed"
 
         # Verify entity was inserted
-        db = self.helper._client[self.helper._db_name]
-        found = db[self.test_collection].find_one({"id": entity["id"]})
-        self.assertIsNotNone(found)
-        self.assertEqual(found["id"], entity["id"])
-        self.assertEqual(found["type"], entity["type"])
+        found = collection.find_one({"id": entity["id"]})
+        assert found is not None
+        assert found["id"] == entity["id"]
+        assert found["type"] == entity["type"]
 
-    def test_insert_entity_upsert(self):
+    def test_insert_entity_upsert(self, helper, entity_template, collection, id_prefix):
         """Test that inserting the same entity twice performs upsert"""
-        entity_id = "urn:ngsi-ld:TestEntity:002"
-        entity1 = self._create_test_entity(entity_id)
+        entity_id = f"{id_prefix}002"
+        entity1 = _mutable_entity(entity_template, entity_id)
         entity1["testProperty"]["value"] = "original value"
 
         # First insert
-        result1 = self.helper.insert_entity(
-            entity1, collection_name=self.test_collection
-        )
-        self.assertTrue(result1)
+        result1 = helper.insert_entity(entity1, collection_name=TEST_COLLECTION)
+        assert result1
 
         # Second insert with updated value (upsert)
-        entity2 = self._create_test_entity(entity_id)
+        entity2 = _mutable_entity(entity_template, entity_id)
         entity2["testProperty"]["value"] = "updated value"
-        result2 = self.helper.insert_entity(
-            entity2, collection_name=self.test_collection
-        )
-        self.assertTrue(result2)
+        result2 = helper.insert_entity(entity2, collection_name=TEST_COLLECTION)
+        assert result2
 
         # Verify only one entity exists with updated value
-        db = self.helper._client[self.helper._db_name]
-        count = db[self.test_collection].count_documents({"id": entity_id})
-        self.assertEqual(count, 1, "Should have exactly one entity after upsert")
+        count = collection.count_documents({"id": entity_id})
+        assert count == 1, "Should have exactly one entity after upsert"
 
-        found = db[self.test_collection].find_one({"id": entity_id})
-        self.assertEqual(found["testProperty"]["value"], "updated value")
+        found = collection.find_one({"id": entity_id})
+        assert found["testProperty"]["value"] == "updated value"
 
-    def test_insert_batch_entities(self):
+    def test_insert_batch_entities(
+        self, helper, entity_template, collection, id_prefix
+    ):
         """Test batch insertion of multiple entities"""
-        entities = [
-            self._create_test_entity(f"urn:ngsi-ld:TestEntity:{i:03d}")
-            for i in range(10)
-        ]
+        # Entities differ only by id; nested properties are shared references
+        entities = [{**entity_template, "id": f"{id_prefix}{i:03d}"} for i in range(10)]
+        template_snapshot = copy.deepcopy(entity_template)
 
         # Batch insert
-        result = self.helper.insert_entities_batch(
-            entities, collection_name=self.test_collection
+        success, failed = helper.insert_entities_batch(
+            entities, collection_name=TEST_COLLECTION
         )
-        self.assertTrue(result, "Batch insertion should succeed")
+        assert success == 10, "All 10 entities should be upserted"
+        assert failed == 0
+
+        # Sharing is only safe if the batch path never mutates its input
+        assert entity_template == template_snapshot
+        for entity in entities:
+            assert "_id" not in entity
+            for key in ("@context", "testProperty", "location"):
+                assert entity[key] is entity_template[key]
 
         # Verify all entities were inserted
-        db = self.helper._client[self.helper._db_name]
-        count = db[self.test_collection].count_documents({"type": "TestEntity"})
-        self.assertEqual(count, 10, "Should have 10 entities after batch insert")
+        count = collection.count_documents(_id_filter(id_prefix))
+        assert count == 10, "Should have 10 entities after batch insert"
 
-    def test_find_entity_by_id(self):
+    def test_insert_batch_single_round_trip(self, helper, entity_template, id_prefix):
+        """Test that a batch is written with one bulk command per collection"""
+        entities = [
+            {**entity_template, "id": f"{id_prefix}bulk-{i:04d}"} for i in range(1000)
+        ]
+
+        # Listener is attached to this helper's client only
+        recorder = _CommandRecorder()
+        batch_helper = MongoDBHelper()
+        batch_helper.config["mongodb"]["database"]["name"] = helper.db.name
+        assert batch_helper.connect(event_listeners=[recorder])
+        try:
+            recorder.recording = True
+            success, failed = batch_helper.insert_entities_batch(
+                entities, collection_name=TEST_COLLECTION
+            )
+            recorder.recording = False
+        finally:
+            batch_helper.close()
+
+        assert (success, failed) == (1000, 0)
+        assert (
+            recorder.commands.count(("insert", TEST_COLLECTION)) == 1
+        ), "New entities should be sent as a single insert command"
+        assert (
+            "update",
+            TEST_COLLECTION,
+        ) not in recorder.commands, "New entities should not go through updates"
+
+    def test_insert_batch_updates_existing(
+        self, helper, entity_template, collection, id_prefix
+    ):
+        """Test that a batch updates existing entities and inserts new ones"""
+        existing = {**entity_template, "id": f"{id_prefix}301"}
+        helper.insert_entity(existing, collection_name=TEST_COLLECTION)
+        inserted_at = collection.find_one({"id": existing["id"]})["_insertedAt"]
+
+        changed = _mutable_entity(entity_template, existing["id"])
+        changed["testProperty"]["value"] = "updated value"
+        new = {**entity_template, "id": f"{id_prefix}302"}
+
+        success, failed = helper.insert_entities_batch(
+            [changed, new], collection_name=TEST_COLLECTION
+        )
+        assert (success, failed) == (2, 0)
+
+        found = collection.find_one({"id": existing["id"]})
+        assert found["testProperty"]["value"] == "updated value"
+        assert found["_insertedAt"] == inserted_at, "Update keeps _insertedAt"
+        assert collection.count_documents(_id_filter(id_prefix)) == 2
+
+    def test_writes_upsert_without_unique_index(self, helper, entity_template):
+        """Republishing into a collection without the "id" index updates"""
+        name = f"test_entities_noindex_{uuid.uuid4().hex[:8]}"
+        entity = _mutable_entity(entity_template, "urn:ngsi-ld:TestEntity:noindex")
+        try:
+            assert helper.insert_entity(entity, collection_name=name)
+            entity["testProperty"]["value"] = "updated value"
+            assert helper.insert_entity(entity, collection_name=name)
+            assert helper.insert_entities_batch([entity], collection_name=name) == (
+                1,
+                0,
+            )
+
+            documents = list(helper.db[name].find({"id": entity["id"]}))
+            assert len(documents) == 1, "No duplicate without a unique index"
+            assert documents[0]["testProperty"]["value"] == "updated value"
+            assert "_insertedAt" in documents[0]
+        finally:
+            helper.db.drop_collection(name)
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize("count", [1000, 10000])
+    def test_insert_faster_than_upsert(
+        self, helper, entity_template, upsert_collection, id_prefix, count
+    ):
+        """Compare insert-first batch writes with unconditional upserts"""
+        entities = [
+            {**entity_template, "id": f"{id_prefix}bench-{i:05d}"} for i in range(count)
+        ]
+        upserts = [
+            UpdateOne({"id": entity["id"]}, {"$set": entity}, upsert=True)
+            for entity in entities
+        ]
+
+        start = time.perf_counter()
+        success, failed = helper.insert_entities_batch(
+            entities, collection_name=TEST_COLLECTION
+        )
+        insert_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        upsert_collection.bulk_write(upserts, ordered=False)
+        upsert_time = time.perf_counter() - start
+
+        assert (success, failed) == (count, 0)
+        assert upsert_collection.count_documents(_id_filter(id_prefix)) == count
+        assert insert_time < upsert_time
+
+    def test_find_entity_by_id(self, helper, entity_template, id_prefix):
         """Test finding an entity by ID"""
-        entity_id = "urn:ngsi-ld:TestEntity:003"
-        entity = self._create_test_entity(entity_id)
+        entity_id = f"{id_prefix}003"
+        entity = {**entity_template, "id": entity_id}
 
         # Insert entity
-        self.helper.insert_entity(entity, collection_name=self.test_collection)
+        helper.insert_entity(entity, collection_name=TEST_COLLECTION)
 
         # Find entity
-        found = self.helper.find_entity(entity_id, collection_name=self.test_collection)
-        self.assertIsNotNone(found)
-        self.assertEqual(found["id"], entity_id)
+        found = helper.find_entity(entity_id, collection_name=TEST_COLLECTION)
+        assert found is not None
+        assert found["id"] == entity_id
 
-    def test_find_entity_not_found(self):
+    def test_find_entity_not_found(self, helper):
         """Test finding a non-existent entity returns None"""
-        found = self.helper.find_entity(
-            "urn:ngsi-ld:TestEntity:nonexistent", collection_name=self.test_collection
+        found = helper.find_entity(
+            "urn:ngsi-ld:TestEntity:nonexistent", collection_name=TEST_COLLECTION
+        )
+        assert found is None
+
+    def test_find_entities_by_ids(self, helper, entity_template, id_prefix):
+        """Test finding several entities by ID in one query"""
+        entity_ids = [f"{id_prefix}201", f"{id_prefix}202"]
+        helper.insert_entities_batch(
+            [{**entity_template, "id": entity_id} for entity_id in entity_ids],
+            collection_name=TEST_COLLECTION,
+        )
+
+        found = helper.find_entities(
+            [*entity_ids, f"{id_prefix}nonexistent"], collection_name=TEST_COLLECTION
         )
-        self.assertIsNone(found)
+        assert sorted(entity["id"] for entity in found) == entity_ids
 
-    def test_find_near_location(self):
+    def test_find_near_location(self, helper, entity_template, id_prefix):
         """Test geospatial query for nearby entities"""
         # Insert entities at different locations
-        entity1 = self._create_test_entity("urn:ngsi-ld:TestEntity:101")
+        entity1 = _mutable_entity(entity_template, f"{id_prefix}101")
         entity1["location"]["value"]["coordinates"] = [
             105.8342,
             21.0278,
         ]  # Hanoi center
 
-        entity2 = self._create_test_entity("urn:ngsi-ld:TestEntity:102")
+        entity2 = _mutable_entity(entity_template, f"{id_prefix}102")
         entity2["location"]["value"]["coordinates"] = [105.8400, 21.0300]  # ~1km away
 
-        entity3 = self._create_test_entity("urn:ngsi-ld:TestEntity:103")
+        entity3 = _mutable_entity(entity_template, f"{id_prefix}103")
         entity3["location"]["value"]["coordinates"] = [106.8342, 22.0278]  # ~150km away
 
-        self.helper.insert_entity(entity1, collection_name=self.test_collection)
-        self.helper.insert_entity(entity2, collection_name=self.test_collection)
-        self.helper.insert_entity(entity3, collection_name=self.test_collection)
+        helper.insert_entity(entity1, collection_name=TEST_COLLECTION)
+        helper.insert_entity(entity2, collection_name=TEST_COLLECTION)
+        helper.insert_entity(entity3, collection_name=TEST_COLLECTION)
 
         # Find entities within 2km of Hanoi center
-        nearby = self.helper.find_near_location(
+        nearby = helper.find_near_location(
+            "TestEntity",
             longitude=105.8342,
             latitude=21.0278,
-            max_distance=2000,  # 2km in meters
-            collection_name=self.test_collection,
+            max_distance_meters=2000,  # 2km in meters
+            collection_name=TEST_COLLECTION,
         )
 
-        self.assertEqual(len(nearby), 2, "Should find 2 entities within 2km")
-        entity_ids = {e["id"] for e in nearby}
-        self.assertIn("urn:ngsi-ld:TestEntity:101", entity_ids)
-        self.assertIn("urn:ngsi-ld:TestEntity:102", entity_ids)
-        self.assertNotIn("urn:ngsi-ld:TestEntity:103", entity_ids)
+        entity_ids = {e["id"] for e in nearby if e["id"].startswith(id_prefix)}
+        assert len(entity_ids) == 2, "Should find 2 entities within 2km"
+        assert f"{id_prefix}101" in entity_ids
+        assert f"{id_prefix}102" in entity_ids
+        assert f"{id_prefix}103" not in entity_ids
 
-    def test_insert_invalid_entity(self):
+    def test_insert_invalid_entity(self, helper):
         """Test handling of invalid entity (missing required fields)"""
         invalid_entity = {
             "type": "TestEntity"
@@ -219,85 +403,75 @@ class TestMongoDBPublisher(unittest.TestCase):
         }
 
         # Should return False but not raise exception
-        result = self.helper.insert_entity(
-            invalid_entity, collection_name=self.test_collection
-        )
-        self.assertFalse(result, "Insert should fail gracefully for invalid entity")
+        result = helper.insert_entity(invalid_entity, collection_name=TEST_COLLECTION)
+        assert not result, "Insert should fail gracefully for invalid entity"
 
-    def test_batch_insert_partial_failure(self):
+    def test_batch_insert_partial_failure(
+        self, helper, entity_template, collection, id_prefix
+    ):
         """Test batch insert with some invalid entities"""
         entities = [
-            self._create_test_entity("urn:ngsi-ld:TestEntity:201"),
+            {**entity_template, "id": f"{id_prefix}201"},
             {"type": "TestEntity"},  # Invalid: missing 'id'
-            self._create_test_entity("urn:ngsi-ld:TestEntity:202"),
+            {**entity_template, "id": f"{id_prefix}202"},
         ]
 
         # Should still succeed for valid entities
         # Note: Result indicates overall success, individual failures handled internally
-        _ = self.helper.insert_entities_batch(
+        _ = helper.insert_entities_batch(
             entities,
-            collection_name=self.test_collection,
+            collection_name=TEST_COLLECTION,
             ordered=False,  # Continue on error
         )
 
         # At least some entities should be inserted
-        db = self.helper._client[self.helper._db_name]
-        count = db[self.test_collection].count_documents({"type": "TestEntity"})
-        self.assertGreaterEqual(
-            count, 2, "Valid entities should be inserted despite invalid ones"
-        )
+        count = collection.count_documents(_id_filter(id_prefix))
+        assert count >= 2, "Valid entities should be inserted despite invalid ones"
 
-    def test_connection_pooling(self):
+    def test_connection_pooling(self, helper):
         """Test that connection pooling works correctly"""
         # Get multiple helper instances
         helper1 = get_mongodb_helper()
         helper2 = get_mongodb_helper()
 
         # Should be the same instance (singleton pattern)
-        self.assertIs(helper1, helper2, "Should return same helper instance")
+        assert helper1 is helper2, "Should return same helper instance"
 
         # Both should share the same client
-        self.assertIs(
-            helper1._client, helper2._client, "Should share same client connection"
-        )
+        assert helper1.client is helper2.client, "Should share same client connection"
 
-    def test_collection_mapping(self):
+    def test_collection_mapping(
+        self, helper, entity_template, camera_collection, id_prefix
+    ):
         """Test that collection names are properly mapped from entity types"""
-        entity = self._create_test_entity(
-            "urn:ngsi-ld:Camera:001", entity_type="Camera"
-        )
+        entity = {**entity_template, "id": f"{id_prefix}CAM001", "type": "Camera"}
 
         # Should use collection mapping from config
-        result = self.helper.insert_entity(entity)
-        self.assertTrue(result)
+        result = helper.insert_entity(entity)
+        assert result
 
         # Verify entity is in correct collection
-        expected_collection = self.helper._collection_map.get(
-            "Camera", "ngsi_ld_entities"
-        )
-        db = self.helper._client[self.helper._db_name]
-        found = db[expected_collection].find_one({"id": entity["id"]})
-        self.assertIsNotNone(found)
-
-        # Clean up
-        db[expected_collection].delete_one({"id": entity["id"]})
+        found = camera_collection.find_one({"id": entity["id"]})
+        assert found is not None
 
 
-class TestMongoDBGracefulDegradation(unittest.TestCase):
+class TestMongoDBGracefulDegradation:
     """Test graceful degradation when MongoDB is unavailable"""
 
     def test_import_without_pymongo(self):
         """Test that code works even without pymongo installed"""
         # This test just verifies the import doesn't crash
         # The actual test is that MONGODB_AVAILABLE flag exists
-        self.assertIsInstance(MONGODB_AVAILABLE, bool)
+        assert isinstance(MONGODB_AVAILABLE, bool)
 
-    @unittest.skipIf(MONGODB_AVAILABLE, "Test only runs when MongoDB unavailable")
+    @pytest.mark.skipif(
+        MONGODB_AVAILABLE, reason="Test only runs when MongoDB unavailable"
+    )
     def test_helper_unavailable(self):
         """Test behavior when MongoDB is not available"""
         # When pymongo not installed, get_mongodb_helper should be None
-        self.assertFalse(MONGODB_AVAILABLE)
+        assert not MONGODB_AVAILABLE
 
 
 if __name__ == "__main__":
-    unittest.main()
+    pytest.main([__file__, "-v"])
@@ -26,7 +26,6 @@ Usage:
 import os
 
 import pytest
-from neo4j import GraphDatabase
 
 # Skip tests if external services are not available
 REQUIRES_NEO4J = pytest.mark.skipif(
@@ -40,54 +39,46 @@ REQUIRES_NEO4J = pytest.mark.skipif(
 @pytest.mark.requires_docker
 @REQUIRES_NEO4J
 class TestNeo4jIntegration:
-    """Test Neo4j graph database integration."""
+    """Test Neo4j graph database integration.
 
-    @pytest.fixture
-    def neo4j_driver(self):
-        """Create Neo4j driver instance."""
-        driver = GraphDatabase.driver(
-            "bolt://localhost:7687", auth=("neo4j", "password")
-        )
-        yield driver
-        driver.close()
+    Uses the session-scoped neo4j_driver from tests/integration/conftest.py;
+    clean_neo4j removes the TEST-prefixed nodes each test creates.
+    """
 
-    def test_cypher_query_execution(self, neo4j_driver):
+    def test_cypher_query_execution(self, clean_neo4j, test_id_prefix):
         """Test Cypher query execution."""
-        with neo4j_driver.session() as session:
+        with clean_neo4j.session() as session:
             # Create a test node
             result = session.run(
                 "CREATE (c:Camera {id: $id, name: $name}) RETURN c",
-                id="TEST001",
+                id=f"{test_id_prefix}001",
                 name="Test Camera",
             )
             record = result.single()
             assert record is not None
 
-            # Clean up
-            session.run("MATCH (c:Camera {id: 'TEST001'}) DELETE c")
-
-    def test_entity_sync(self, neo4j_driver):
+    def test_entity_sync(self, clean_neo4j, test_id_prefix):
         """Test entity synchronization from NGSI-LD to Neo4j."""
-        with neo4j_driver.session() as session:
+        with clean_neo4j.session() as session:
             # Simulate sync operation
             entities = [
-                {"id": "CAM001", "name": "Camera 1"},
-                {"id": "CAM002", "name": "Camera 2"},
+                {"id": f"{test_id_prefix}CAM001", "name": "Camera 1"},
+                {"id": f"{test_id_prefix}CAM002", "name": "Camera 2"},
             ]
 
-            for entity in entities:
-                session.run(
-                    "MERGE (c:Camera {id: $id}) SET c.name = $name",
-                    id=entity["id"],
-                    name=entity["name"],
-                )
+            # One managed write transaction, one round trip for all entities
+            session.execute_write(
+                lambda tx: tx.run(
+                    "UNWIND $rows AS row "
+                    "MERGE (c:Camera {id: row.id}) SET c.name = row.name",
+                    rows=entities,
+                ).consume()
+            )
 
             # Verify
             result = session.run(
-                "MATCH (c:Camera) WHERE c.id STARTS WITH 'CAM' RETURN count(c) as count"
+                "MATCH (c:Camera) WHERE c.id IN $ids RETURN count(c) as count",
+                ids=[entity["id"] for entity in entities],
             )
             count = result.single()["count"]
-            assert count >= 2
-
-            # Clean up
-            session.run("MATCH (c:Camera) WHERE c.id STARTS WITH 'CAM' DELETE c")
+            assert count == 2
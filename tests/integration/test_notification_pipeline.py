@@ -22,8 +22,10 @@ Usage:
     pytest tests/integration/test_notification_pipeline.py
 """
 
-from unittest.mock import Mock, patch
+import smtplib
+from email.mime.text import MIMEText
 
+import httpx
 import pytest
 
 
@@ -31,53 +33,38 @@ import pytest
 class TestNotificationPipeline:
     """Test notification delivery pipeline."""
 
-    @patch("smtplib.SMTP")
-    def test_email_notification_delivery(self, mock_smtp):
+    def test_email_notification_delivery(self, smtp_sink):
         """Test email delivery via SMTP."""
-        # Setup mock SMTP
-        smtp_instance = Mock()
-        mock_smtp.return_value.__enter__.return_value = smtp_instance
-
-        # Send email
-        import smtplib
-        from email.mime.text import MIMEText
-
         msg = MIMEText("Test notification")
         msg["Subject"] = "Test Alert"
         msg["From"] = "system@example.com"
         msg["To"] = "admin@example.com"
 
-        with smtplib.SMTP("localhost", 25) as server:
+        with smtplib.SMTP(smtp_sink.hostname, smtp_sink.port) as server:
             server.send_message(msg)
 
-        # Verify SMTP was called
-        mock_smtp.assert_called_with("localhost", 25)
+        # Verify the sink received it
+        delivered = smtp_sink.messages[-1]
+        assert delivered["Subject"] == "Test Alert"
+        assert delivered["X-RcptTo"] == "admin@example.com"
+        assert delivered.get_payload().strip() == "Test notification"
 
     @pytest.mark.asyncio
-    @patch("requests.post")
-    async def test_webhook_notification(self, mock_post):
+    async def test_webhook_notification(self, webhook_router):
         """Test webhook delivery via HTTP POST."""
-        # Setup mock response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"status": "received"}
-        mock_post.return_value = mock_response
-
-        # Send webhook
-        import requests
-
         payload = {
             "event": "accident_detected",
             "severity": "high",
             "location": {"lat": 10.762622, "lon": 106.660172},
         }
 
-        response = requests.post(
-            "http://example.com/webhook",
-            json=payload,
-            headers={"Content-Type": "application/json"},
-        )
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                "http://example.com/webhook",
+                json=payload,
+                headers={"Content-Type": "application/json"},
+            )
 
         assert response.status_code == 200
         assert response.json()["status"] == "received"
-        mock_post.assert_called_once()
+        assert webhook_router["webhook"].call_count == 1
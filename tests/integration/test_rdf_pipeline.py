@@ -45,12 +45,16 @@ class TestRDFPipeline:
         }
 
         # Convert to RDF
-        g = Graph()
+        g = Graph(store="Memory")
         TRAFFIC = Namespace("http://example.org/traffic#")
 
+        # Build all quads first and hand them to the store in one addN call
         camera_uri = URIRef(ngsi_ld_entity["id"])
-        g.add((camera_uri, RDF.type, TRAFFIC.Camera))
-        g.add((camera_uri, RDFS.label, Literal(ngsi_ld_entity["name"]["value"])))
+        quads = [
+            (camera_uri, RDF.type, TRAFFIC.Camera, g),
+            (camera_uri, RDFS.label, Literal(ngsi_ld_entity["name"]["value"]), g),
+        ]
+        g.addN(quads)
 
         # Verify RDF graph
         assert len(g) >= 2
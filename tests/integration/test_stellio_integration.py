@@ -28,9 +28,10 @@ Usage:
 """
 
 import os
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import httpx
+import orjson
 import pytest
 
 # Skip tests if external services are not available
@@ -45,71 +46,67 @@ REQUIRES_STELLIO = pytest.mark.skipif(
 @pytest.mark.requires_docker
 @REQUIRES_STELLIO
 class TestStellioIntegration:
-    """Integration tests for Stellio Context Broker."""
+    """Integration tests for Stellio Context Broker.
 
-    @pytest.fixture
-    def stellio_url(self):
-        """Stellio base URL."""
-        return "http://localhost:8080/ngsi-ld/v1"
+    Uses the session-scoped http_client fixture from
+    tests/integration/conftest.py: one HTTP/2 connection pool on the session
+    event loop, with paths relative to the Stellio NGSI-LD base URL.
+    """
 
-    @pytest.fixture
-    async def http_client(self):
-        """HTTP client for Stellio."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            yield client
-
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_create_entity(
         self,
         http_client: httpx.AsyncClient,
-        stellio_url: str,
         sample_ngsi_ld_entity: Dict[str, Any],
+        clean_stellio: List[str],
+        test_id_prefix: str,
     ):
         """Test creating NGSI-LD entity in Stellio."""
+        entity = {
+            **sample_ngsi_ld_entity,
+            "id": f"urn:ngsi-ld:TrafficCamera:{test_id_prefix}001",
+        }
         response = await http_client.post(
-            f"{stellio_url}/entities",
-            json=sample_ngsi_ld_entity,
+            "/entities",
+            content=orjson.dumps(entity),
             headers={"Content-Type": "application/ld+json"},
         )
+        clean_stellio.append(entity["id"])
 
         assert response.status_code == 201
         assert "Location" in response.headers
 
-    @pytest.mark.asyncio
-    async def test_get_entity(self, http_client: httpx.AsyncClient, stellio_url: str):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_entity(self, http_client: httpx.AsyncClient):
         """Test retrieving entity from Stellio."""
         entity_id = "urn:ngsi-ld:TrafficCamera:TEST001"
 
         response = await http_client.get(
-            f"{stellio_url}/entities/{entity_id}",
+            f"/entities/{entity_id}",
             headers={"Accept": "application/ld+json"},
         )
 
         # Entity might not exist in test environment
         assert response.status_code in [200, 404]
 
-    @pytest.mark.asyncio
-    async def test_query_entities(
-        self, http_client: httpx.AsyncClient, stellio_url: str
-    ):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_query_entities(self, http_client: httpx.AsyncClient):
         """Test querying entities by type."""
         response = await http_client.get(
-            f"{stellio_url}/entities",
+            "/entities",
             params={"type": "TrafficCamera"},
             headers={"Accept": "application/ld+json"},
         )
 
         assert response.status_code == 200
-        entities = response.json()
+        entities = orjson.loads(response.content)
         assert isinstance(entities, list)
 
-    @pytest.mark.asyncio
-    async def test_temporal_query(
-        self, http_client: httpx.AsyncClient, stellio_url: str
-    ):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_temporal_query(self, http_client: httpx.AsyncClient):
         """Test temporal entity query."""
         response = await http_client.get(
-            f"{stellio_url}/temporal/entities",
+            "/temporal/entities",
             params={
                 "type": "TrafficObservation",
                 "timerel": "after",
@@ -22,73 +22,113 @@ Usage:
     pytest tests/integration/test_transformation_pipeline.py
 """
 
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping
 
 import pytest
 
+NGSI_LD_CONTEXT = "https://uri.etsi.org/ngsi-ld/v1/ngsi-ld-core-context.jsonld"
+VEHICLES_PER_HOUR_UNIT = "http://qudt.org/vocab/unit/NUM-PER-HR"
+
+
+def raw_to_ngsi_ld(raw: Mapping[str, Any]) -> Dict[str, Any]:
+    """Transform raw camera data to an NGSI-LD Camera entity."""
+    return {
+        "id": f"urn:ngsi-ld:Camera:{raw['id']}",
+        "type": "Camera",
+        "name": {"type": "Property", "value": raw["name"]},
+        "location": {
+            "type": "GeoProperty",
+            "value": {
+                "type": "Point",
+                "coordinates": [raw["longitude"], raw["latitude"]],
+            },
+        },
+        "status": {"type": "Property", "value": raw["status"]},
+        "@context": [NGSI_LD_CONTEXT],
+    }
+
+
+def ngsi_ld_to_sosa(obs: Mapping[str, Any]) -> Dict[str, Any]:
+    """Transform an NGSI-LD observation to a SOSA observation."""
+    return {
+        "@id": obs["id"],
+        "@type": "sosa:Observation",
+        "sosa:resultTime": obs["observedAt"],
+        "sosa:hasSimpleResult": obs["trafficFlow"]["value"],
+        "qudt:unit": VEHICLES_PER_HOUR_UNIT,
+    }
+
+
+# Read-only test data, built once at import and shared by every case
+
+# Sample raw camera data
+RAW_CAMERA = MappingProxyType(
+    {
+        "id": "CAM001",
+        "name": "Traffic Camera 1",
+        "latitude": 10.762622,
+        "longitude": 106.660172,
+        "status": "active",
+    }
+)
+
+EXPECTED_NGSI_LD = MappingProxyType(
+    {
+        "id": "urn:ngsi-ld:Camera:CAM001",
+        "type": "Camera",
+        "name": {"type": "Property", "value": "Traffic Camera 1"},
+        "location": {
+            "type": "GeoProperty",
+            "value": {"type": "Point", "coordinates": [106.660172, 10.762622]},
+        },
+        "status": {"type": "Property", "value": "active"},
+        "@context": [NGSI_LD_CONTEXT],
+    }
+)
+
+# NGSI-LD observation
+NGSI_LD_OBSERVATION = MappingProxyType(
+    {
+        "id": "urn:ngsi-ld:Observation:OBS001",
+        "type": "Observation",
+        "observedAt": "2025-11-29T10:30:00Z",
+        "trafficFlow": {
+            "type": "Property",
+            "value": 120,
+            "unitCode": "E47",  # vehicles/hour
+        },
+    }
+)
+
+EXPECTED_SOSA = MappingProxyType(
+    {
+        "@id": "urn:ngsi-ld:Observation:OBS001",
+        "@type": "sosa:Observation",
+        "sosa:resultTime": "2025-11-29T10:30:00Z",
+        "sosa:hasSimpleResult": 120,
+        "qudt:unit": VEHICLES_PER_HOUR_UNIT,
+    }
+)
+
+CASES = [
+    pytest.param(raw_to_ngsi_ld, RAW_CAMERA, EXPECTED_NGSI_LD, id="raw-to-ngsi-ld"),
+    pytest.param(
+        ngsi_ld_to_sosa, NGSI_LD_OBSERVATION, EXPECTED_SOSA, id="ngsi-ld-to-sosa"
+    ),
+]
+
 
 @pytest.mark.integration
 class TestTransformationPipeline:
     """Test data transformation flow with real assertions."""
 
-    def test_raw_to_ngsi_ld_transformation(self):
-        """Test transformation from raw data to NGSI-LD format."""
-        # Sample raw camera data
-        raw_data = {
-            "id": "CAM001",
-            "name": "Traffic Camera 1",
-            "latitude": 10.762622,
-            "longitude": 106.660172,
-            "status": "active",
-        }
-
-        # Transform to NGSI-LD
-        ngsi_ld_entity = {
-            "id": f"urn:ngsi-ld:Camera:{raw_data['id']}",
-            "type": "Camera",
-            "name": {"type": "Property", "value": raw_data["name"]},
-            "location": {
-                "type": "GeoProperty",
-                "value": {
-                    "type": "Point",
-                    "coordinates": [raw_data["longitude"], raw_data["latitude"]],
-                },
-            },
-            "status": {"type": "Property", "value": raw_data["status"]},
-            "@context": ["https://uri.etsi.org/ngsi-ld/v1/ngsi-ld-core-context.jsonld"],
-        }
-
-        # Verify transformation
-        assert ngsi_ld_entity["id"].startswith("urn:ngsi-ld:Camera:")
-        assert ngsi_ld_entity["type"] == "Camera"
-        assert ngsi_ld_entity["name"]["type"] == "Property"
-        assert ngsi_ld_entity["location"]["type"] == "GeoProperty"
-        assert len(ngsi_ld_entity["location"]["value"]["coordinates"]) == 2
-
-    def test_ngsi_ld_to_sosa_transformation(self):
-        """Test transformation from NGSI-LD to SOSA ontology."""
-        # NGSI-LD observation
-        ngsi_ld_obs = {
-            "id": "urn:ngsi-ld:Observation:OBS001",
-            "type": "Observation",
-            "observedAt": "2025-11-29T10:30:00Z",
-            "trafficFlow": {
-                "type": "Property",
-                "value": 120,
-                "unitCode": "E47",  # vehicles/hour
-            },
-        }
-
-        # Transform to SOSA
-        sosa_observation = {
-            "@id": ngsi_ld_obs["id"],
-            "@type": "sosa:Observation",
-            "sosa:resultTime": ngsi_ld_obs["observedAt"],
-            "sosa:hasSimpleResult": ngsi_ld_obs["trafficFlow"]["value"],
-            "qudt:unit": "http://qudt.org/vocab/unit/NUM-PER-HR",
-        }
-
-        # Verify SOSA structure
-        assert sosa_observation["@type"] == "sosa:Observation"
-        assert "sosa:resultTime" in sosa_observation
-        assert "sosa:hasSimpleResult" in sosa_observation
-        assert sosa_observation["sosa:hasSimpleResult"] == 120
+    @pytest.mark.parametrize("transform, source, expected", CASES)
+    def test_transformation(
+        self,
+        transform: Callable[[Mapping[str, Any]], Dict[str, Any]],
+        source: Mapping[str, Any],
+        expected: Mapping[str, Any],
+    ):
+        """Test raw -> NGSI-LD and NGSI-LD -> SOSA transformations."""
+        assert transform(source) == expected
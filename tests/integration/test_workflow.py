@@ -23,26 +23,127 @@ Usage:
     pytest tests/integration/test_workflow.py
 """
 
+import functools
+import hashlib
+import mmap
 import os
+import pickle
+import tempfile
+from collections import defaultdict
 from pathlib import Path
-from unittest.mock import Mock, patch
+from typing import Dict, FrozenSet, List, Set
+from unittest.mock import patch
 
 import pytest
 import yaml
 
+from src.core.config_loader import YamlSafeLoader
+
+
+@pytest.fixture(scope="session")
+def workflow_config(config_dir: Path, request: pytest.FixtureRequest):
+    """
+    Load workflow configuration once per session (tests only read it).
+
+    workflow.yaml is memory-mapped and hashed with md5; the parsed YAML is
+    pickled into the pytest cache as wf-<digest>.pickle, so later runs skip
+    YAML parsing until the file changes (or --cache-clear is used). A
+    truncated or unreadable pickle is ignored and rewritten; writes go
+    through a temp file so concurrent xdist workers never see a partial one.
+    """
+    path = config_dir / "workflow.yaml"
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            digest = hashlib.md5(mm).hexdigest()
+
+    cache = getattr(request.config, "cache", None)  # None with -p no:cacheprovider
+    cache_file = None
+    if cache is not None:
+        cache_file = cache.mkdir("uip-workflow") / f"wf-{digest}.pickle"
+
+    config = None
+    if cache_file is not None and cache_file.exists():
+        try:
+            config = pickle.loads(cache_file.read_bytes())
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            config = None  # Corrupt or stale cache entry - re-parse below
+
+    if config is None:
+        config = yaml.load(path.read_bytes(), Loader=YamlSafeLoader)
+        if cache_file is not None:
+            fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as tmp:
+                    pickle.dump(config, tmp, pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, cache_file)
+            except OSError:
+                Path(tmp_name).unlink(missing_ok=True)
+
+    # Return workflow section or full config
+    return config.get("workflow", config)
+
+
+class _Stub:
+    """Minimal agent stand-in: run() returns a fixed result and counts calls."""
+
+    def __init__(self, result: Dict):
+        self.result = result
+        self.calls = 0
+
+    def run(self) -> Dict:
+        self.calls += 1
+        return self.result
+
+
+# Package every workflow agent module must live under
+AGENT_PACKAGE_PREFIX = "src.agents."
+
+
+@pytest.fixture(scope="session")
+def agent_modules(workflow_config) -> List[str]:
+    """Module path of every agent referenced by the workflow."""
+    return [
+        agent["module"]
+        for phase in workflow_config["phases"]
+        for agent in phase["agents"]
+    ]
+
+
+@pytest.fixture(scope="session")
+def agent_module_paths(agent_modules: List[str], project_root: Path) -> List[Path]:
+    """File path of every agent module referenced by the workflow."""
+    return [
+        project_root / (module.replace(".", "/") + ".py") for module in agent_modules
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _file_names(directory: Path) -> FrozenSet[str]:
+    """Names of the files in directory, from a single os.scandir."""
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(entry.name for entry in entries if entry.is_file())
+    except FileNotFoundError:
+        return frozenset()
+
+
+def _missing_files(paths: List[Path]) -> List[Path]:
+    """Paths that do not exist, checked per parent directory."""
+    expected_by_dir: Dict[Path, Set[str]] = defaultdict(set)
+    for path in paths:
+        expected_by_dir[path.parent].add(path.name)
+
+    return sorted(
+        parent / name
+        for parent, expected in expected_by_dir.items()
+        for name in expected - _file_names(parent)
+    )
+
 
 @pytest.mark.integration
 class TestWorkflowOrchestration:
     """Test multi-phase workflow orchestration."""
 
-    @pytest.fixture
-    def workflow_config(self, config_dir: Path):
-        """Load workflow configuration."""
-        with open(config_dir / "workflow.yaml", "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
-        # Return workflow section or full config
-        return config.get("workflow", config)
-
     def test_workflow_config_valid(self, workflow_config):
         """Test workflow configuration is valid."""
         assert "phases" in workflow_config
@@ -51,7 +152,7 @@ class TestWorkflowOrchestration:
 
     def test_all_phases_have_required_fields(self, workflow_config):
         """Test all phases have required fields."""
-        required_fields = ["name", "agents"]  # description is optional
+        required_fields = ["name", "description", "agents"]
 
         for phase in workflow_config["phases"]:
             for field in required_fields:
@@ -59,34 +160,34 @@ class TestWorkflowOrchestration:
 
     def test_all_agents_have_module_paths(self, workflow_config):
         """Test all agents have valid module paths."""
-        for phase in workflow_config["phases"]:
-            for agent in phase["agents"]:
-                assert "module" in agent
-                assert agent["module"].startswith("src.agents.")
+        agents = [
+            agent for phase in workflow_config["phases"] for agent in phase["agents"]
+        ]
+        without_module = [agent for agent in agents if "module" not in agent]
+        assert not without_module, f"Agents without module: {without_module}"
+
+        outside = [
+            agent["module"]
+            for agent in agents
+            if not agent["module"].startswith(AGENT_PACKAGE_PREFIX)
+        ]
+        assert not outside, f"Agent modules outside {AGENT_PACKAGE_PREFIX}: {outside}"
 
     @pytest.mark.skipif(
         os.environ.get("CI", "false").lower() == "true",
         reason="Agent modules may not be fully accessible in CI",
     )
-    def test_agent_modules_exist(self, workflow_config, project_root: Path):
+    def test_agent_modules_exist(self, agent_module_paths: List[Path]):
         """Test all agent modules exist as files."""
-        for phase in workflow_config["phases"]:
-            for agent in phase["agents"]:
-                module_path = agent["module"]
-                # Convert module path to file path
-                file_path = module_path.replace(".", "/") + ".py"
-                full_path = project_root / file_path
-
-                assert full_path.exists(), f"Agent module not found: {full_path}"
+        missing = _missing_files(agent_module_paths)
+        assert not missing, f"Agent modules not found: {missing}"
 
-    @pytest.mark.asyncio
     @patch("src.agents.data_collection.image_refresh_agent.ImageRefreshAgent")
-    async def test_phase_execution_mock(self, mock_agent):
+    def test_phase_execution_mock(self, mock_agent):
         """Test phase execution with mocked agents."""
 
-        # Mock agent execution
-        mock_instance = Mock()
-        mock_instance.run = Mock(return_value={"status": "success", "processed": 10})
+        # Stub agent execution
+        mock_instance = _Stub({"status": "success", "processed": 10})
         mock_agent.return_value = mock_instance
 
         # Simulate phase execution
@@ -95,7 +196,7 @@ class TestWorkflowOrchestration:
         # Verify execution
         assert result["status"] == "success"
         assert result["processed"] == 10
-        mock_instance.run.assert_called_once()
+        assert mock_instance.calls == 1
 
     def test_parallel_vs_sequential_phases(self, workflow_config):
         """Test parallel and sequential phase configuration."""
@@ -16,57 +16,121 @@ License: MIT
 
 Description:
     Tests the Citizen Ingestion API with real image files from the local filesystem.
-    Validates image upload, base64 encoding, and proper handling of binary data.
+    The image is served over HTTP from a local static file server, so the
+    pipeline fetches it by URL like any other report image.
 
 Usage:
     python tests/test_citizen_with_real_image.py
 """
 
-import base64
-import json
+import sys
+import threading
 import time
 from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 # API Configuration
 CITIZEN_API_URL = "http://localhost:8001/api/v1/citizen-reports"
 STELLIO_URL = "http://localhost:8080/ngsi-ld/v1/entities"
 
+# One pooled session for every call to the API and Stellio, so requests
+# after the first reuse the open connection instead of reconnecting
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_SESSION.headers.update({"Connection": "keep-alive"})
+
+
+def poll_until(url, predicate, timeout=10, initial=0.25, factor=1.5):
+    """
+    GET url until predicate(JSON body) holds, sleeping with exponential backoff.
+
+    Returns the matching body, or None once timeout seconds have passed.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while True:
+        try:
+            response = _SESSION.get(
+                url, headers={"Accept": "application/ld+json"}, timeout=10
+            )
+            if response.status_code == 200:
+                body = orjson.loads(response.content)
+                if predicate(body):
+                    return body
+        except requests.RequestException:
+            pass  # Not reachable yet - retry until the deadline
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(delay, remaining))
+        delay *= factor
+
+
+def is_latest_observation(entity_id):
+    """Predicate: entity_id is the newest CitizenObservation in the response."""
+    return lambda entities: bool(entities) and entities[0].get("id") == entity_id
+
+
+# Attributes verify_complete_entity inspects; Stellio returns only these
+ENTITY_ATTRS = ",".join(
+    [
+        "category",
+        "description",
+        "location",
+        "imageSnapshot",
+        "reportedBy",
+        "dateObserved",
+        "weatherContext",
+        "airQualityContext",
+        "status",
+        "aiVerified",
+        "aiConfidence",
+    ]
+)
+
 # Image file path
 IMAGE_PATH = Path("runs/accident_detection/labels.jpg")
 
+# Local static file server the pipeline downloads IMAGE_PATH from
+IMAGE_SERVER_PORT = 9000
+
+
+# Background work listed while waiting; written in one call
+BACKGROUND_TASKS = """
+⚙️  Background tasks đang chạy:
+  1️⃣  Gọi OpenWeatherMap API (nhiệt độ, độ ẩm, áp suất, gió)
+  2️⃣  Gọi OpenAQ API v3 (AQI, PM2.5, PM10, NO2, O3)
+  3️⃣  Transform sang NGSI-LD format (12 fields)
+  4️⃣  Publish entity lên Stellio Context Broker
+
+"""
+
 
 def print_section(title):
-    print(f"\n{'='*80}")
-    print(f"  {title}")
-    print(f"{'='*80}")
+    rule = "=" * 80
+    sys.stdout.write(f"\n{rule}\n  {title}\n{rule}\n")
 
 
-def encode_image_to_base64(image_path):
-    """Encode local image to base64 data URL"""
-    try:
-        with open(image_path, "rb") as img_file:
-            img_data = img_file.read()
-            b64_data = base64.b64encode(img_data).decode("utf-8")
-            # Determine MIME type
-            ext = image_path.suffix.lower()
-            mime_type = {
-                ".jpg": "image/jpeg",
-                ".jpeg": "image/jpeg",
-                ".png": "image/png",
-                ".webp": "image/webp",
-            }.get(ext, "image/jpeg")
-
-            data_url = f"data:{mime_type};base64,{b64_data}"
-            print(f"✅ Encoded {image_path.name} ({len(img_data)} bytes)")
-            print(f"   Base64 length: {len(b64_data)} characters")
-            print(f"   Data URL length: {len(data_url)} characters")
-            return data_url
-    except Exception as e:
-        print(f"❌ Error encoding image: {e}")
-        return None
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler without per-request access logging."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_image_directory(directory, port=IMAGE_SERVER_PORT):
+    """Serve directory over HTTP from a daemon thread; returns the server."""
+    handler = partial(_QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("localhost", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
 
 
 def send_test_report_with_image(image_url):
@@ -93,17 +157,14 @@ def send_test_report_with_image(image_url):
 
     print("\n📍 Location:", location["name"])
     print(f"📍 Coordinates: ({location['lat']}, {location['lon']})")
-    print(
-        f"📷 Image URL type:",
-        "Base64 Data URL" if image_url.startswith("data:") else "HTTP URL",
-    )
+    print(f"📷 Image URL: {image_url}")
     print(f"📝 Description: {report_data['description'][:80]}...")
 
     try:
         print(f"\n🚀 Sending POST request to {CITIZEN_API_URL}...")
-        response = requests.post(
+        response = _SESSION.post(
             CITIZEN_API_URL,
-            json=report_data,
+            data=orjson.dumps(report_data),
             headers={"Content-Type": "application/json"},
             timeout=30,  # Tăng timeout vì có base64 image
         )
@@ -111,7 +172,7 @@ def send_test_report_with_image(image_url):
         print(f"\n✅ Response Status: {response.status_code}")
 
         if response.status_code == 202:
-            response_data = response.json()
+            response_data = orjson.loads(response.content)
             print("\n📥 Response Data:")
             print(f"  Status: {response_data.get('status')}")
             print(f"  Message: {response_data.get('message')}")
@@ -128,20 +189,22 @@ def send_test_report_with_image(image_url):
         return None
 
 
-def wait_for_background_processing(seconds=8):
+def wait_for_background_processing(report_id, timeout=8):
     """Chờ background task hoàn thành"""
     print_section("BƯỚC 2: CHỜ XỬ LÝ BACKGROUND")
 
-    print("\n⚙️  Background tasks đang chạy:")
-    print("  1️⃣  Gọi OpenWeatherMap API (nhiệt độ, độ ẩm, áp suất, gió)")
-    print("  2️⃣  Gọi OpenAQ API v3 (AQI, PM2.5, PM10, NO2, O3)")
-    print("  3️⃣  Transform sang NGSI-LD format (12 fields)")
-    print("  4️⃣  Publish entity lên Stellio Context Broker")
-
-    for i in range(seconds, 0, -1):
-        print(f"\r⏱️  Chờ {i:2d} giây để hoàn thành...", end="", flush=True)
-        time.sleep(1)
-    print("\n✅ Hoàn tất!")
+    sys.stdout.write(BACKGROUND_TASKS)
+    entity_id = f"urn:ngsi-ld:CitizenObservation:{report_id}"
+    started = time.monotonic()
+    entities = poll_until(
+        f"{STELLIO_URL}?type=CitizenObservation&limit=1",
+        is_latest_observation(entity_id),
+        timeout=timeout,
+    )
+    if entities is None:
+        print(f"\n⚠️  {entity_id} chưa có trong Stellio sau {timeout} giây")
+    else:
+        print(f"\n✅ Hoàn tất sau {time.monotonic() - started:.1f} giây!")
 
 
 def query_latest_citizen_observation():
@@ -150,14 +213,14 @@ def query_latest_citizen_observation():
 
     try:
         print(f"\n🔍 Querying: {STELLIO_URL}?type=CitizenObservation")
-        response = requests.get(
-            f"{STELLIO_URL}?type=CitizenObservation&limit=1",
+        response = _SESSION.get(
+            f"{STELLIO_URL}?type=CitizenObservation&limit=1&attrs={ENTITY_ATTRS}",
             headers={"Accept": "application/ld+json"},
             timeout=10,
         )
 
         if response.status_code == 200:
-            entities = response.json()
+            entities = orjson.loads(response.content)
 
             if isinstance(entities, list) and len(entities) > 0:
                 entity = entities[0]  # Latest entity
@@ -178,6 +241,22 @@ def query_latest_citizen_observation():
         return None
 
 
+# Placeholder shown for absent entity fields
+MISSING = "❌ MISSING"
+
+
+def _v(entity, key, default=None, attr="value"):
+    """Read entity[key][attr] (an NGSI-LD Property value), or default."""
+    node = entity.get(key)
+    return node.get(attr, default) if isinstance(node, dict) else default
+
+
+def _location(entity):
+    """GeoProperty coordinates and geometry type of the entity."""
+    point = _v(entity, "location", {})
+    return {"coords": point.get("coordinates", []), "type": point.get("type", "")}
+
+
 def verify_complete_entity(entity):
     """Kiểm tra entity có đầy đủ 12 fields và hiển thị chi tiết"""
     print_section("BƯỚC 4: KIỂM TRA CẤU TRÚC DỮ LIỆU (12 FIELDS)")
@@ -188,68 +267,60 @@ def verify_complete_entity(entity):
     )
 
     fields_info = [
-        ("id", "ID của entity", lambda e: e.get("id", "❌ MISSING")),
-        ("type", "Loại entity", lambda e: e.get("type", "❌ MISSING")),
+        ("id", "ID của entity", lambda e: e.get("id", MISSING)),
+        ("type", "Loại entity", lambda e: e.get("type", MISSING)),
         (
             "category",
             "Loại incident (user input)",
-            lambda e: e.get("category", {}).get("value", "❌ MISSING"),
+            partial(_v, key="category", default=MISSING),
         ),
         (
             description_field,
             "Mô tả (user input)",
-            lambda e: e.get(description_field, {}).get("value", "❌ MISSING"),
-        ),
-        (
-            "location",
-            "Tọa độ GPS (user input)",
-            lambda e: {
-                "coords": e.get("location", {}).get("value", {}).get("coordinates", []),
-                "type": e.get("location", {}).get("value", {}).get("type", ""),
-            },
+            partial(_v, key=description_field, default=MISSING),
         ),
+        ("location", "Tọa độ GPS (user input)", _location),
         (
             "imageSnapshot",
             "URL hình ảnh (user input)",
-            lambda e: e.get("imageSnapshot", {}).get("value", "❌ MISSING")[:50]
-            + "...",
+            lambda e: _v(e, "imageSnapshot", MISSING)[:50] + "...",
         ),
         (
             "reportedBy",
             "User ID (user input)",
-            lambda e: e.get("reportedBy", {}).get("object", "❌ MISSING"),
+            partial(_v, key="reportedBy", default=MISSING, attr="object"),
         ),
         (
             "dateObserved",
             "Thời gian báo cáo (user input)",
-            lambda e: e.get("dateObserved", {}).get("value", "❌ MISSING"),
+            partial(_v, key="dateObserved", default=MISSING),
         ),
         (
             "weatherContext",
             "Dữ liệu thời tiết (auto-enrichment)",
-            lambda e: e.get("weatherContext", {}).get("value", {}),
+            partial(_v, key="weatherContext", default={}),
         ),
         (
             "airQualityContext",
             "Dữ liệu chất lượng không khí (auto-enrichment)",
-            lambda e: e.get("airQualityContext", {}).get("value", {}),
+            partial(_v, key="airQualityContext", default={}),
         ),
         (
             "status",
             "Trạng thái xác minh",
-            lambda e: e.get("status", {}).get("value", "❌ MISSING"),
+            partial(_v, key="status", default=MISSING),
         ),
         (
             "aiVerified",
             "Đã verify bởi AI?",
-            lambda e: e.get("aiVerified", {}).get("value", "❌ MISSING"),
+            partial(_v, key="aiVerified", default=MISSING),
         ),
         (
             "aiConfidence",
             "Độ tin cậy AI",
-            lambda e: e.get("aiConfidence", {}).get("value", "❌ MISSING"),
+            partial(_v, key="aiConfidence", default=MISSING),
         ),
-        ("@context", "NGSI-LD context", lambda e: e.get("@context", "❌ MISSING")),
+        ("@context", "NGSI-LD context", lambda e: e.get("@context", MISSING)),
     ]
 
     print("\n📋 CHI TIẾT CÁC TRƯỜNG DỮ LIỆU:\n")
@@ -260,7 +331,7 @@ def verify_complete_entity(entity):
         try:
             value = value_func(entity)
 
-            if value and value != "❌ MISSING":
+            if value and value != MISSING:
                 present_count += 1
                 status = "✅"
             else:
@@ -317,22 +388,21 @@ def save_entity_to_file(entity):
     try:
         output_file.parent.mkdir(exist_ok=True)
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(entity, f, indent=2, ensure_ascii=False)
+        # Serialize once; the preview is cut from the same bytes
+        payload = orjson.dumps(entity, option=orjson.OPT_INDENT_2)
+        output_file.write_bytes(payload)
 
         print(f"\n✅ Đã lưu kết quả vào: {output_file}")
-        print(f"   File size: {output_file.stat().st_size} bytes")
+        print(f"   File size: {len(payload)} bytes")
 
         # Hiển thị một phần JSON
         print(f"\n📄 Preview (50 dòng đầu):")
         print("-" * 80)
-        with open(output_file, "r", encoding="utf-8") as f:
-            for i, line in enumerate(f, 1):
-                if i <= 50:
-                    print(line.rstrip())
-                else:
-                    print(f"... ({output_file.stat().st_size} bytes total)")
-                    break
+        lines = payload.decode("utf-8").split("\n", 50)
+        for line in lines[:50]:
+            print(line)
+        if len(lines) > 50:
+            print(f"... ({len(payload)} bytes total)")
 
         return True
     except Exception as e:
@@ -357,9 +427,9 @@ def main():
     print(f"\n📷 Sử dụng hình ảnh: {IMAGE_PATH}")
     print(f"   File size: {IMAGE_PATH.stat().st_size:,} bytes")
 
-    # Create image URL for the report
-    # Using mock HCMC traffic monitor URL (real image would be uploaded separately)
-    image_url = f"https://traffic-monitor.hcmc.gov.vn/images/accident_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
+    # Serve the image locally so the pipeline can download it by URL
+    serve_image_directory(IMAGE_PATH.parent)
+    image_url = f"http://localhost:{IMAGE_SERVER_PORT}/{IMAGE_PATH.name}"
 
     print(f"📎 Image URL: {image_url[:80]}...")
 
@@ -370,7 +440,7 @@ def main():
         return
 
     # Bước 2: Chờ xử lý
-    wait_for_background_processing(8)
+    wait_for_background_processing(response["reportId"], timeout=8)
 
     # Bước 3: Query Stellio
     entity = query_latest_citizen_observation()
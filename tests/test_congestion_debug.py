@@ -22,30 +22,30 @@ Usage:
     python tests/test_congestion_debug.py
 """
 
-import json
-
 from src.agents.analytics.congestion_detection_agent import CongestionDetectionAgent
+from tests._observations import load_observations
 
 agent = CongestionDetectionAgent()
-with open("data/observations.json") as f:
-    obs = json.load(f)
+
+# Parsed once per process and file revision
+obs = load_observations()
 
 print(f"Total observations: {len(obs)}\n")
 
-# Test first 5 observations
-for i, sample in enumerate(obs[:5]):
+# Test first 5 observations (thresholds evaluated in one batched call)
+samples = obs[:5]
+for i, (sample, result) in enumerate(
+    zip(samples, agent.detector.evaluate_many(samples))
+):
     print(f"=== Observation {i} ===")
     print(f"ID: {sample.get('id')}")
 
-    try:
-        should_update, new_state, reason, observed_at = agent.detector.evaluate(sample)
+    if result is None:
+        print("  ERROR: evaluation failed (see log)")
+    else:
+        should_update, new_state, reason, observed_at = result
         print(f"  should_update: {should_update}")
         print(f"  new_state: {new_state}")
         print(f"  reason: {reason}")
         print(f"  observed_at: {observed_at}")
-    except Exception as e:
-        print(f"  ERROR: {e}")
-        import traceback
-
-        traceback.print_exc()
     print()
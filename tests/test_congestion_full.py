@@ -19,14 +19,15 @@ Description:
     Tests the complete flow from observation file to congestion state updates.
 """
 
-import json
+import orjson
 
 from src.agents.analytics.congestion_detection_agent import CongestionDetectionAgent
 
 agent = CongestionDetectionAgent()
 
-print("=== Testing process_observations_file ===\n")
-results = agent.process_observations_file("data/observations.json")
+# Observations are parsed incrementally when ijson is installed
+print("=== Testing process_observations_stream ===\n")
+results = agent.process_observations_stream("data/observations.json")
 
 print(f"\nTotal results: {len(results)}")
 print(f"Updated cameras: {sum(1 for r in results if r.get('updated'))}")
@@ -43,8 +44,8 @@ for i, res in enumerate(results[:10]):
 import os
 
 if os.path.exists("data/congestion.json"):
-    with open("data/congestion.json") as f:
-        congestion = json.load(f)
+    with open("data/congestion.json", "rb") as f:
+        congestion = orjson.loads(f.read())
     print(f"\n=== Congestion Events (data/congestion.json) ===")
     print(f"Total events: {len(congestion)}")
     if congestion:
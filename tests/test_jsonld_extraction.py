@@ -31,6 +31,13 @@ vehicleCount_data = [
 ]
 
 
+# Expanded JSON-LD key of a Property's value
+NGSI_HAS_VALUE = "https://uri.etsi.org/ngsi-ld/hasValue"
+
+# Default for dict.get() where None is a legitimate value
+_MISSING = object()
+
+
 def extract_jsonld_value(data):
     """Extract value from JSON-LD."""
     if data is None:
@@ -43,25 +50,30 @@ def extract_jsonld_value(data):
     # Handle dict
     if isinstance(data, dict):
         # Direct @value
-        if "@value" in data:
-            return data["@value"]
+        value = data.get("@value", _MISSING)
+        if value is not _MISSING:
+            return value
 
         # NGSI-LD value
-        if "value" in data:
-            return data["value"]
-
-        # JSON-LD hasValue
-        for key in data.keys():
-            if "hasValue" in key:
-                has_value_data = data[key]
-                if isinstance(has_value_data, list) and len(has_value_data) > 0:
-                    value_item = has_value_data[0]
-                    if isinstance(value_item, dict) and "@value" in value_item:
-                        return value_item["@value"]
-                    return value_item
-                elif isinstance(has_value_data, dict) and "@value" in has_value_data:
-                    return has_value_data["@value"]
-                return has_value_data
+        value = data.get("value", _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # JSON-LD hasValue: direct lookup of the standard IRI, else scan keys
+        if NGSI_HAS_VALUE in data:
+            key = NGSI_HAS_VALUE
+        else:
+            key = next((key for key in data if "hasValue" in key), None)
+        if key is not None:
+            has_value_data = data[key]
+            if isinstance(has_value_data, list) and len(has_value_data) > 0:
+                value_item = has_value_data[0]
+                if isinstance(value_item, dict) and "@value" in value_item:
+                    return value_item["@value"]
+                return value_item
+            elif isinstance(has_value_data, dict) and "@value" in has_value_data:
+                return has_value_data["@value"]
+            return has_value_data
 
     return data
 
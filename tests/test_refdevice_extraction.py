@@ -33,12 +33,17 @@ payload = {
 
 rel_name = "refDevice"
 
-# Test helper logic
+# Test helper logic (mirrors Neo4jSyncAgent._extract_relationship_object):
+# expanded IRIs end with "/refDevice"; case-insensitive search only as fallback
+suffix = "/" + rel_name
+rel_lower = rel_name.lower()
+
 for key in payload.keys():
+    matches = key.endswith(suffix) or rel_lower in key.lower()
     print(f"Key: {key}")
-    print(f"Contains refDevice: {rel_name.lower() in key.lower()}")
+    print(f"Contains refDevice: {matches}")
 
-    if rel_name.lower() in key.lower():
+    if matches:
         rel_data = payload[key]
         print(f"rel_data type: {type(rel_data)}")
         print(f"rel_data: {rel_data}")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit Test Fixtures.
+
+UIP - Urban Intelligence Platform
+Copyright (c) 2025 UIP Team. All rights reserved.
+https://github.com/UIP-Urban-Intelligence-Platform/UIP-Urban_Intelligence_Platform
+
+SPDX-License-Identifier: MIT
+
+Module: tests.unit.conftest
+Author: Nguyen Nhat Quang
+Created: 2025-12-08
+Version: 1.0.0
+License: MIT
+
+Description:
+    Network client stubs for the unit suites. Unit tests never talk to a
+    real Redis or HTTP endpoint, so redis.Redis, aiohttp.ClientSession and
+    httpx.AsyncClient are replaced by MagicMocks once for the whole
+    tests/unit package instead of being patched per test. The stubs are
+    package-scoped, so integration suites running later on the same
+    worker see the real clients again.
+
+    Fixtures include:
+    - network_stubs: {"redis": ..., "aiohttp": ..., "httpx": ...} mocks
+
+Usage:
+    Automatically loaded by pytest for tests/unit.
+"""
+
+import importlib
+from typing import Any, Dict, Iterator
+from unittest.mock import MagicMock
+
+import pytest
+
+# (module, attribute, key in network_stubs) replaced for every unit test
+NETWORK_CLIENTS = [
+    ("redis", "Redis", "redis"),
+    ("aiohttp", "ClientSession", "aiohttp"),
+    ("httpx", "AsyncClient", "httpx"),
+]
+
+
+@pytest.fixture(scope="package", autouse=True)
+def network_stubs() -> Iterator[Dict[str, Any]]:
+    """Replace network client classes with MagicMocks for tests/unit."""
+    stubs = {}
+    with pytest.MonkeyPatch.context() as mp:
+        for module_name, attr, key in NETWORK_CLIENTS:
+            try:
+                module = importlib.import_module(module_name)
+            except ImportError:
+                continue  # Optional client not installed - nothing to stub
+            stubs[key] = MagicMock(name=f"{module_name}.{attr}")
+            mp.setattr(module, attr, stubs[key])
+        yield stubs
@@ -22,6 +22,55 @@ Usage:
     pytest tests/unit/test_accident_detection.py
 """
 
+from bisect import bisect_right
+
+import numpy as np
+
+# Accident signature between consecutive observations
+SPEED_DROP_THRESHOLD = 40  # km/h
+DENSITY_INCREASE_THRESHOLD = 50  # %
+
+
+def detect_batch(speeds: np.ndarray, densities: np.ndarray) -> np.ndarray:
+    """
+    Flag accidents across a window of observations in one vectorized pass.
+
+    Element i is True when, from observation i to i + 1, speed drops by more
+    than SPEED_DROP_THRESHOLD and density rises by more than
+    DENSITY_INCREASE_THRESHOLD.
+    """
+    speed_drop = speeds[:-1] - speeds[1:]
+    density_increase = densities[1:] - densities[:-1]
+    return (speed_drop > SPEED_DROP_THRESHOLD) & (
+        density_increase > DENSITY_INCREASE_THRESHOLD
+    )
+
+
+# Severity buckets by speed drop: <30 minor, 30-49 moderate, >=50 severe
+SEVERITY_THRESHOLDS = np.array([30, 50], dtype=np.float32)
+SEVERITY_LABELS = np.array(["minor", "moderate", "severe"])
+_SEVERITY_THRESHOLDS_LIST = SEVERITY_THRESHOLDS.tolist()
+
+
+def classify_severity_batch(speed_drops: np.ndarray) -> np.ndarray:
+    """Severity label of each speed drop, bucketed without branching."""
+    # side="right": a drop equal to a threshold belongs to the higher bucket
+    return SEVERITY_LABELS[
+        np.searchsorted(SEVERITY_THRESHOLDS, speed_drops, side="right")
+    ]
+
+
+def classify_severity(speed_drop: float) -> str:
+    """Scalar form of classify_severity_batch."""
+    return str(SEVERITY_LABELS[bisect_right(_SEVERITY_THRESHOLDS_LIST, speed_drop)])
+
+
+def _window(observations, key: str) -> np.ndarray:
+    """Values of key across observations (float32 is ample for thresholds)."""
+    return np.fromiter(
+        (obs[key] for obs in observations), dtype=np.float32, count=len(observations)
+    )
+
 
 class TestAccidentDetection:
     """Test accident detection logic."""
@@ -34,16 +83,32 @@ class TestAccidentDetection:
             {"speed": 15, "density": 80, "timestamp": "10:05"},  # Accident signature
         ]
 
-        # Detection logic
-        speed_drop = observations[0]["speed"] - observations[1]["speed"]
-        density_increase = observations[1]["density"] - observations[0]["density"]
+        speeds = _window(observations, "speed")
+        densities = _window(observations, "density")
 
         # Threshold: speed drops >40 km/h AND density increases >50%
-        accident_detected = speed_drop > 40 and density_increase > 50
+        accident_detected = detect_batch(speeds, densities)
+
+        assert accident_detected.tolist() == [True]
+        assert speeds[0] - speeds[1] == 45
+        assert densities[1] - densities[0] == 60
+
+    def test_detect_accidents_across_window(self):
+        """Batch detection flags only the transitions with the signature."""
+        observations = [
+            {"speed": 60, "density": 20},
+            {"speed": 55, "density": 25},  # Normal slowdown
+            {"speed": 10, "density": 90},  # Accident signature
+            {"speed": 12, "density": 95},
+            {"speed": 70, "density": 10},  # Recovery
+            {"speed": 25, "density": 40},  # Speed drop only
+        ]
+
+        accident_detected = detect_batch(
+            _window(observations, "speed"), _window(observations, "density")
+        )
 
-        assert accident_detected is True
-        assert speed_drop == 45
-        assert density_increase == 60
+        assert np.flatnonzero(accident_detected).tolist() == [1]
 
     def test_severity_classification(self):
         """Test severity level classification."""
@@ -53,13 +118,27 @@ class TestAccidentDetection:
             {"speed_drop": 60, "severity": "severe"},
         ]
 
+        drops = _window(accidents, "speed_drop")
+
+        assert classify_severity_batch(drops).tolist() == [
+            accident["severity"] for accident in accidents
+        ]
         for accident in accidents:
-            drop = accident["speed_drop"]
-            if drop < 30:
-                expected = "minor"
-            elif drop < 50:
-                expected = "moderate"
-            else:
-                expected = "severe"
-
-            assert accident["severity"] == expected
+            assert classify_severity(accident["speed_drop"]) == accident["severity"]
+
+    def test_severity_classification_boundaries(self):
+        """Drops equal to a threshold fall into the higher bucket."""
+        drops = np.array([29.9, 30, 49.9, 50], dtype=np.float32)
+
+        assert classify_severity_batch(drops).tolist() == [
+            "minor",
+            "moderate",
+            "moderate",
+            "severe",
+        ]
+        assert [classify_severity(drop) for drop in (29.9, 30, 49.9, 50)] == [
+            "minor",
+            "moderate",
+            "moderate",
+            "severe",
+        ]
@@ -22,22 +22,33 @@ Usage:
     pytest tests/unit/test_cache_manager.py
 """
 
-from unittest.mock import MagicMock, patch
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
 
 import pytest
 
 from src.agents.cache.cache_manager_agent import CacheManagerAgent
 
+# Fixed clock for TTL entries: deterministic and no wall-clock reads
+_NOW = datetime(2025, 1, 1, 0, 0, 0)
+
+
+@pytest.fixture(scope="module")
+def cache_manager():
+    """Cache manager instance shared by the module's tests."""
+    config = {"enabled": False}  # Disabled for unit tests
+    return CacheManagerAgent(config)
+
+
+@pytest.fixture(autouse=True)
+def _empty_local_cache(cache_manager):
+    """Start every test with an empty in-memory cache."""
+    cache_manager._local_cache.clear()
+
 
 class TestCacheManager:
     """Test cache operations with real assertions."""
 
-    @pytest.fixture
-    def cache_manager(self):
-        """Create cache manager instance."""
-        config = {"enabled": False}  # Disabled for unit tests
-        return CacheManagerAgent(config)
-
     def test_cache_set_get(self, cache_manager):
         """Test basic set/get operations."""
         cache_manager._local_cache["test_key"] = "test_value"
@@ -46,23 +57,23 @@ class TestCacheManager:
 
     def test_ttl_expiration(self, cache_manager):
         """Test TTL-based expiration logic."""
-        from datetime import datetime
-
         # Test that default TTL is set correctly
         assert cache_manager._default_ttl == 3600
 
         # Test that local cache is accessible
-        cache_manager._local_cache["test_expire_key"] = ("value", datetime.utcnow())
+        cache_manager._local_cache["test_expire_key"] = (
+            "value",
+            _NOW - timedelta(seconds=10),
+        )
         assert "test_expire_key" in cache_manager._local_cache
 
         # Verify cache manager has TTL configuration
         assert hasattr(cache_manager, "_default_ttl")
 
-    @patch("redis.Redis")
-    def test_redis_connection(self, mock_redis):
+    def test_redis_connection(self, network_stubs):
         """Test Redis connection when enabled."""
         mock_client = MagicMock()
-        mock_redis.return_value = mock_client
+        network_stubs["redis"].return_value = mock_client
 
         config = {"enabled": True, "redis_host": "localhost", "redis_port": 6379}
 
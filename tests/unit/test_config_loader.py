@@ -23,46 +23,56 @@ Usage:
 """
 
 import os
+import shutil
 
 import pytest
 import yaml
 
 # Import load_config from correct module
 try:
-    from src.core.config_loader import load_config
+    from src.core.config_loader import load_cached_yaml, load_config
 
     CONFIG_LOADER_AVAILABLE = True
 except ImportError:
     load_config = None
+    load_cached_yaml = None
     CONFIG_LOADER_AVAILABLE = False
 
 
+# Written once per module; tests that modify a config use their own copy
+@pytest.fixture(scope="module")
+def sample_yaml_file(tmp_path_factory):
+    """Create a temporary YAML config file."""
+    config_data = {
+        "agents": {"enabled": True, "log_level": "INFO"},
+        "redis": {"host": "localhost", "port": 6379},
+    }
+    config_file = tmp_path_factory.mktemp("config") / "test_config.yaml"
+    with open(config_file, "w") as f:
+        yaml.dump(config_data, f)
+    return config_file
+
+
+@pytest.fixture(scope="module")
+def loaded_config(sample_yaml_file):
+    """sample_yaml_file parsed once by load_config (read-only)."""
+    return load_config(str(sample_yaml_file))
+
+
 @pytest.mark.skipif(not CONFIG_LOADER_AVAILABLE, reason="load_config not available")
 class TestConfigLoader:
     """Test config loading functionality."""
 
-    @pytest.fixture
-    def sample_yaml_file(self, tmp_path):
-        """Create a temporary YAML config file."""
-        config_data = {
-            "agents": {"enabled": True, "log_level": "INFO"},
-            "redis": {"host": "localhost", "port": 6379},
-        }
-        config_file = tmp_path / "test_config.yaml"
-        with open(config_file, "w") as f:
-            yaml.dump(config_data, f)
-        return config_file
-
-    def test_load_yaml_config(self, sample_yaml_file):
+    def test_load_yaml_config(self, loaded_config):
         """Test YAML config loading."""
-        config = load_config(str(sample_yaml_file))
+        config = loaded_config
         assert config is not None
         assert "agents" in config
         assert config["agents"]["enabled"] is True
 
-    def test_env_variable_substitution(self, tmp_path):
+    def test_env_variable_substitution(self, tmp_path, monkeypatch):
         """Test environment variable replacement."""
-        os.environ["TEST_PORT"] = "9999"
+        monkeypatch.setenv("TEST_PORT", "9999")
 
         config_data = {"port": "${TEST_PORT}"}
         config_file = tmp_path / "env_config.yaml"
@@ -73,11 +83,28 @@ class TestConfigLoader:
         # Would need env substitution logic in load_config
         assert "port" in config
 
-    def test_config_validation(self, sample_yaml_file):
+    def test_config_validation(self, loaded_config):
         """Test config structure validation."""
-        config = load_config(str(sample_yaml_file))
+        config = loaded_config
 
         # Validate required fields
         assert isinstance(config, dict)
         assert "redis" in config
         assert config["redis"]["port"] == 6379
+
+    def test_cached_yaml_reparses_on_mtime_change(self, sample_yaml_file, tmp_path):
+        """Test cached YAML parse is reused until the file changes."""
+        # Private copy: this test rewrites the file
+        sample_yaml_file = shutil.copy(sample_yaml_file, tmp_path)
+        mtime = os.path.getmtime(sample_yaml_file)
+        first = load_cached_yaml(str(sample_yaml_file), mtime)
+        assert load_cached_yaml(str(sample_yaml_file), mtime) is first
+
+        with open(sample_yaml_file, "w") as f:
+            yaml.dump({"redis": {"port": 6380}}, f)
+        os.utime(sample_yaml_file, (mtime + 10, mtime + 10))
+
+        updated = load_cached_yaml(
+            str(sample_yaml_file), os.path.getmtime(sample_yaml_file)
+        )
+        assert updated["redis"]["port"] == 6380
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Congestion Detection Unit Test Suite.
+
+UIP - Urban Intelligence Platform
+Copyright (c) 2025 UIP Team. All rights reserved.
+https://github.com/UIP-Urban-Intelligence-Platform/UIP-Urban_Intelligence_Platform
+
+SPDX-License-Identifier: MIT
+
+Module: tests.unit.test_congestion_detection
+Author: Nguyen Nhat Quang
+Created: 2025-12-08
+Version: 1.0.0
+License: MIT
+
+Description:
+    Unit tests for the congestion rule evaluation of CongestionDetector.
+    Checks that batched evaluation matches per-entity evaluation, and that
+    CongestionDetectionAgent.process_observations_stream reads array-shaped
+    and object-wrapped observation files alike, with or without ijson.
+
+Usage:
+    pytest tests/unit/test_congestion_detection.py
+"""
+
+import json
+
+import pytest
+
+from src.agents.analytics import congestion_detection_agent
+from src.agents.analytics.congestion_detection_agent import (
+    CongestionConfig,
+    CongestionDetectionAgent,
+    CongestionDetector,
+    StateStore,
+)
+
+OBSERVED_AT = "2025-12-09T15:07:34Z"
+
+
+def _observation(camera: str, occupancy, speed, intensity) -> dict:
+    """ItemFlowObserved entity for camera; None values are left out."""
+    entity = {
+        "id": f"urn:ngsi-ld:ItemFlowObserved:{camera}",
+        "refDevice": {"type": "Relationship", "object": f"urn:ngsi-ld:Camera:{camera}"},
+    }
+    for prop, value in (
+        ("occupancy", occupancy),
+        ("averageSpeed", speed),
+        ("intensity", intensity),
+    ):
+        if value is not None:
+            entity[prop] = {
+                "type": "Property",
+                "value": value,
+                "observedAt": OBSERVED_AT,
+            }
+    return entity
+
+
+@pytest.fixture
+def detector(tmp_path, config_dir) -> CongestionDetector:
+    """Detector with the project thresholds and an empty state store."""
+    config = CongestionConfig(str(config_dir / "congestion_config.yaml"))
+    return CongestionDetector(config, StateStore(str(tmp_path / "state.json")))
+
+
+@pytest.fixture
+def stream_agent() -> CongestionDetectionAgent:
+    """Agent whose process_entities returns the parsed entities unchanged.
+
+    __init__ is skipped (it needs Stellio/PostgreSQL config); the stream
+    method only dispatches to process_entities / process_observations_file.
+    """
+    agent = CongestionDetectionAgent.__new__(CongestionDetectionAgent)
+    agent.process_entities = list
+    return agent
+
+
+@pytest.fixture
+def observations() -> list:
+    """Two observations with float and integer property values."""
+    return [_observation("0", 0.9, 5.0, 0.9), _observation("1", 0.2, 61, 0.2)]
+
+
+class TestCongestionDetector:
+    """Test congestion rule evaluation."""
+
+    @pytest.mark.parametrize("logic", ["AND", "OR"])
+    def test_evaluate_many_matches_evaluate(self, detector, logic):
+        """Batched evaluation returns exactly what evaluate() returns."""
+        detector.logic = logic
+        entities = [
+            _observation("0", 0.9, 5.0, 0.9),  # All thresholds breached
+            _observation("1", 0.2, 61.3, 0.2),  # Free flow
+            _observation("2", 0.9, None, 0.9),  # Missing speed
+            _observation("3", 0.9, 50.0, 0.1),  # Occupancy only
+        ]
+
+        assert detector.evaluate_many(entities) == [
+            detector.evaluate(entity) for entity in entities
+        ]
+
+    def test_evaluate_many_marks_unusable_entities(self, detector):
+        """Entities without a camera reference yield None, not an exception."""
+        entities = [{"type": "ItemFlowObserved"}, _observation("0", 0.2, 61.3, 0.2)]
+
+        results = detector.evaluate_many(entities)
+
+        assert results[0] is None
+        assert results[1] == detector.evaluate(entities[1])
+
+
+class TestProcessObservationsStream:
+    """Test file-shape dispatch of process_observations_stream."""
+
+    @pytest.mark.skipif(
+        not congestion_detection_agent.IJSON_AVAILABLE, reason="ijson not installed"
+    )
+    def test_array_file_is_streamed(
+        self, stream_agent, observations, tmp_path, monkeypatch
+    ):
+        """A top-level array is parsed item by item, not via json.load."""
+        path = tmp_path / "observations.json"
+        path.write_text(json.dumps(observations), encoding="utf-8")
+        monkeypatch.setattr(
+            stream_agent,
+            "process_observations_file",
+            lambda _: pytest.fail("array file fell back to json.load"),
+        )
+
+        assert stream_agent.process_observations_stream(str(path)) == observations
+
+    def test_object_wrapped_file_falls_back(self, stream_agent, observations, tmp_path):
+        """{"observations": [...]} files are read by process_observations_file."""
+        path = tmp_path / "observations.json"
+        path.write_text(
+            json.dumps({"observations": observations}, indent=2), encoding="utf-8"
+        )
+
+        assert stream_agent.process_observations_stream(str(path)) == observations
+
+    def test_array_file_without_ijson_falls_back(
+        self, stream_agent, observations, tmp_path, monkeypatch
+    ):
+        """Without ijson an array file still yields every observation."""
+        path = tmp_path / "observations.json"
+        path.write_text(json.dumps(observations), encoding="utf-8")
+        monkeypatch.setattr(congestion_detection_agent, "IJSON_AVAILABLE", False)
+
+        assert stream_agent.process_observations_stream(str(path)) == observations
+
+    def test_missing_file_raises(self, stream_agent, tmp_path):
+        """A missing input file raises FileNotFoundError like the eager path."""
+        with pytest.raises(FileNotFoundError):
+            stream_agent.process_observations_stream(str(tmp_path / "missing.json"))
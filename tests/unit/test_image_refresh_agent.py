@@ -22,23 +22,17 @@ Usage:
     pytest tests/unit/test_image_refresh_agent.py
 """
 
-from unittest.mock import patch
+import copy
+import re
 
 import pytest
 
 from src.agents.data_collection.image_refresh_agent import ImageRefreshAgent
 
+# http(s) URL scheme accepted for camera image URLs
+_URL_RE = re.compile(r"^https?://")
 
-class TestImageRefreshAgent:
-    """Test suite for ImageRefreshAgent."""
-
-    @pytest.fixture
-    def mock_config_file(self, tmp_path):
-        """Create temporary config file for testing."""
-        config_dir = tmp_path / "config"
-        config_dir.mkdir()
-        config_file = config_dir / "data_sources.yaml"
-        config_content = """
+CONFIG_YAML = """
 cameras:
   source_file: data/test.json
   output_file: data/output.json
@@ -50,14 +44,34 @@ cameras:
   request_timeout: 10
   max_retries: 3
 """
-        config_file.write_text(config_content)
-        return str(config_file)
 
-    @pytest.fixture
-    def agent(self, mock_config_file):
-        """Create agent instance for testing."""
-        agent = ImageRefreshAgent(config_path=mock_config_file, domain="cameras")
-        return agent
+
+@pytest.fixture(scope="module")
+def mock_config_file(tmp_path_factory):
+    """Config file for the module's tests, written once (agents only read it)."""
+    config_dir = tmp_path_factory.mktemp("config")
+    config_file = config_dir / "data_sources.yaml"
+    config_file.write_text(CONFIG_YAML)
+    return str(config_file)
+
+
+@pytest.fixture(scope="class")
+def agent(mock_config_file):
+    """Agent instance shared by a test class (config parsed once)."""
+    return ImageRefreshAgent(config_path=mock_config_file, domain="cameras")
+
+
+@pytest.fixture(autouse=True)
+def _restore_stats(agent):
+    """Undo any test's changes to the shared agent's stats."""
+    snapshot = copy.copy(agent.stats)
+    yield
+    agent.stats.clear()
+    agent.stats.update(snapshot)
+
+
+class TestImageRefreshAgent:
+    """Test suite for ImageRefreshAgent."""
 
     def test_agent_initialization(self, agent):
         """Test agent initializes correctly."""
@@ -89,20 +103,13 @@ cameras:
     )
     def test_validate_url(self, agent, url, expected):
         """Test URL validation."""
-        # URL validation logic - test basic parsing
-        if url is None or url == "":
-            assert expected is False
-        elif url.startswith(("http://", "https://")):
-            assert expected is True
-        else:
-            assert expected is False
+        assert bool(url and _URL_RE.match(url)) is expected
 
     def test_batch_processing(self, agent):
         """Test batch processing of URLs."""
         assert agent.config["batch_size"] == 50
 
-    @patch("aiohttp.ClientSession")
-    def test_async_url_refresh(self, mock_client, agent):
+    def test_async_url_refresh(self, agent):
         """Test async URL refresh."""
         # Test that agent has shutdown event
         assert agent.shutdown_event is not None
@@ -22,47 +22,93 @@ Usage:
     pytest tests/unit/test_ngsi_ld_transformer.py
 """
 
+from types import MappingProxyType
+
+import pytest
+
+OBSERVATION_URN_PREFIX = "urn:ngsi-ld:Observation:"
+CAMERA_URN_PREFIX = "urn:ngsi-ld:Camera:"
+
+# Built once at import; read-only view shared by the tests
+_CTX = MappingProxyType(
+    {
+        "@context": [
+            "https://uri.etsi.org/ngsi-ld/v1/ngsi-ld-core-context.jsonld",
+            {
+                "sosa": "http://www.w3.org/ns/sosa/",
+                "traffic": "http://example.org/traffic#",
+            },
+        ]
+    }
+)
+
+
+def _to_ngsi_ld(observation: dict) -> dict:
+    """Transform a camera observation to an NGSI-LD Observation entity."""
+    camera_id = observation["camera_id"]
+    timestamp = observation["timestamp"]
+    return {
+        "id": OBSERVATION_URN_PREFIX + camera_id + ":" + timestamp,
+        "type": "Observation",
+        "madeBySensor": {
+            "type": "Relationship",
+            "object": CAMERA_URN_PREFIX + camera_id,
+        },
+        "hasResult": {
+            "type": "Property",
+            "value": observation["vehicles"],
+            "observedAt": timestamp,
+        },
+    }
+
 
 class TestNGSILDTransformer:
     """Test NGSI-LD transformation."""
 
-    def test_transform_observation_to_ngsi_ld(self):
+    @pytest.mark.parametrize(
+        "observation,expected",
+        [
+            (
+                {
+                    "camera_id": "CAM001",
+                    "vehicles": 15,
+                    "timestamp": "2025-11-29T10:30:00Z",
+                },
+                15,
+            ),
+            (
+                {
+                    "camera_id": "CAM002",
+                    "vehicles": 0,
+                    "timestamp": "2025-11-29T03:00:00Z",
+                },
+                0,
+            ),
+            (
+                {
+                    "camera_id": "CAM003",
+                    "vehicles": 120,
+                    "timestamp": "2025-11-29T17:45:00Z",
+                },
+                120,
+            ),
+        ],
+    )
+    def test_transform_observation_to_ngsi_ld(self, observation, expected):
         """Test observation transformation to NGSI-LD."""
-        observation = {
-            "camera_id": "CAM001",
-            "vehicles": 15,
-            "timestamp": "2025-11-29T10:30:00Z",
-        }
-
-        # Transform to NGSI-LD
-        ngsi_ld = {
-            "id": f"urn:ngsi-ld:Observation:CAM001:{observation['timestamp']}",
-            "type": "Observation",
-            "madeBySensor": {
-                "type": "Relationship",
-                "object": f"urn:ngsi-ld:Camera:{observation['camera_id']}",
-            },
-            "hasResult": {
-                "type": "Property",
-                "value": observation["vehicles"],
-                "observedAt": observation["timestamp"],
-            },
-        }
+        ngsi_ld = _to_ngsi_ld(observation)
 
         assert ngsi_ld["type"] == "Observation"
-        assert ngsi_ld["hasResult"]["value"] == 15
+        assert ngsi_ld["id"] == (
+            f"urn:ngsi-ld:Observation:{observation['camera_id']}:"
+            f"{observation['timestamp']}"
+        )
+        assert ngsi_ld["madeBySensor"]["object"].endswith(observation["camera_id"])
+        assert ngsi_ld["hasResult"]["value"] == expected
 
     def test_context_linking(self):
         """Test @context generation."""
-        context = {
-            "@context": [
-                "https://uri.etsi.org/ngsi-ld/v1/ngsi-ld-core-context.jsonld",
-                {
-                    "sosa": "http://www.w3.org/ns/sosa/",
-                    "traffic": "http://example.org/traffic#",
-                },
-            ]
-        }
+        context = _CTX
 
         assert "@context" in context
         assert isinstance(context["@context"], list)
@@ -47,8 +47,7 @@ if ORCHESTRATOR_AVAILABLE:
 class TestOrchestrator:
     """Test orchestrator agent execution."""
 
-    @pytest.mark.asyncio
-    async def test_agent_dependency_resolution(self):
+    def test_agent_dependency_resolution(self):
         """Test topological sort of agent dependencies."""
         # Test dependency graph construction
         agents_config = [
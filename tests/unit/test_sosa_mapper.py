@@ -22,37 +22,136 @@ Usage:
     pytest tests/unit/test_sosa_mapper.py
 """
 
+import functools
+import sys
+from array import array
+from types import MappingProxyType
+from typing import NamedTuple
+
+
+class SOSAObs(NamedTuple):
+    """Camera reading to be mapped to a sosa:Observation."""
+
+    sensor_id: str
+    result: int
+    timestamp: str
+
+
+# Read-only inputs, built once at import
+_OBSERVATION = SOSAObs("CAM001", 25, "2025-11-29T10:00:00Z")
+_SENSOR = MappingProxyType(
+    {"id": "CAM001", "type": "Camera", "observes": "traffic:VehicleCount"}
+)
+
+# Synthetic batch as parallel columns (sensor id, result, result time)
+BATCH_SIZE = 1000
+_BATCH_SENSOR_IDS = [f"CAM{i:03d}" for i in range(BATCH_SIZE)]
+_BATCH_RESULTS = array("i", range(BATCH_SIZE))
+_BATCH_TIMESTAMPS = [
+    f"2025-11-29T10:{i // 60 % 60:02d}:{i % 60:02d}Z" for i in range(BATCH_SIZE)
+]
+
+# Static JSON-LD skeletons; tests copy them and fill the None slots
+_URN_SENSOR = "urn:sensor:"
+_OBS_TEMPLATE = {
+    "@type": "sosa:Observation",
+    "sosa:madeBySensor": None,
+    "sosa:hasResult": None,
+    "sosa:resultTime": None,
+}
+_SENSOR_TEMPLATE = {"@id": None, "@type": "sosa:Sensor", "sosa:observes": None}
+
+
+@functools.lru_cache(maxsize=1024)
+def sensor_urn(sensor_id: str) -> str:
+    """Interned sensor URN, built once per sensor id."""
+    return sys.intern(_URN_SENSOR + sensor_id)
+
+
+def to_jsonld(obs: SOSAObs) -> dict:
+    """JSON-LD sosa:Observation for obs, built on demand."""
+    sosa_obs = _OBS_TEMPLATE.copy()
+    sosa_obs["sosa:madeBySensor"] = {"@id": sensor_urn(obs.sensor_id)}
+    sosa_obs["sosa:hasResult"] = {"@type": "sosa:Result", "@value": obs.result}
+    sosa_obs["sosa:resultTime"] = {"@value": obs.timestamp, "@type": "xsd:dateTime"}
+    return sosa_obs
+
+
+_SOSA = "http://www.w3.org/ns/sosa/"
+_XSD = "http://www.w3.org/2001/XMLSchema#"
+_URN_OBSERVATION = "urn:observation:"
+
+
+def to_ntriples(obs: SOSAObs) -> str:
+    """Canonical N-Triples for obs as a sosa:Observation (no RDF parser)."""
+    subject = "<" + _URN_OBSERVATION + obs.sensor_id + ":" + obs.timestamp + ">"
+    return "".join(
+        (
+            f"{subject} <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> "
+            f"<{_SOSA}Observation> .\n",
+            f"{subject} <{_SOSA}madeBySensor> <{sensor_urn(obs.sensor_id)}> .\n",
+            f'{subject} <{_SOSA}hasSimpleResult> "{obs.result}"^^<{_XSD}integer> .\n',
+            f'{subject} <{_SOSA}resultTime> "{obs.timestamp}"^^<{_XSD}dateTime> .\n',
+        )
+    )
+
 
 class TestSOSAMapper:
     """Test SOSA/SSN RDF mapping."""
 
     def test_map_to_sosa_observation(self):
         """Test SOSA observation mapping."""
-        data = {
-            "sensor_id": "CAM001",
-            "result": 25,
-            "timestamp": "2025-11-29T10:00:00Z",
-        }
+        obs = _OBSERVATION
+        assert obs.result == 25
 
-        sosa_obs = {
-            "@type": "sosa:Observation",
-            "sosa:madeBySensor": {"@id": f"urn:sensor:{data['sensor_id']}"},
-            "sosa:hasResult": {"@type": "sosa:Result", "@value": data["result"]},
-            "sosa:resultTime": {"@value": data["timestamp"], "@type": "xsd:dateTime"},
-        }
+        sosa_obs = to_jsonld(obs)
 
         assert sosa_obs["@type"] == "sosa:Observation"
         assert sosa_obs["sosa:hasResult"]["@value"] == 25
 
+    def test_map_to_sosa_ntriples(self):
+        """Test SOSA observation serialized as N-Triples."""
+        lines = to_ntriples(_OBSERVATION).splitlines()
+
+        assert len(lines) == 4
+        assert all(line.endswith(" .") for line in lines)
+        assert lines[0].endswith("<http://www.w3.org/ns/sosa/Observation> .")
+        assert "<urn:sensor:CAM001>" in lines[1]
+        assert '"25"^^<http://www.w3.org/2001/XMLSchema#integer>' in lines[2]
+        assert '"2025-11-29T10:00:00Z"^^' in lines[3]
+
+    def test_map_observation_batch(self):
+        """Test mapping a batch held as parallel columns into one @graph."""
+        sensor_ids = _BATCH_SENSOR_IDS
+        results = _BATCH_RESULTS
+        timestamps = _BATCH_TIMESTAMPS
+
+        # One document for the whole batch instead of one per observation
+        graph = {
+            "@context": {"sosa": _SOSA, "xsd": _XSD},
+            "@graph": [
+                to_jsonld(SOSAObs(*row)) for row in zip(sensor_ids, results, timestamps)
+            ],
+        }
+        mapped = graph["@graph"]
+
+        assert len(mapped) == BATCH_SIZE
+        assert mapped[25] == to_jsonld(SOSAObs("CAM025", 25, timestamps[25]))
+        assert [m["sosa:madeBySensor"]["@id"] for m in mapped] == [
+            "urn:sensor:" + sensor_id for sensor_id in sensor_ids
+        ]
+        assert [m["sosa:hasResult"]["@value"] for m in mapped] == list(results)
+        assert [m["sosa:resultTime"]["@value"] for m in mapped] == timestamps
+
     def test_sensor_mapping(self):
         """Test sensor entity mapping to SOSA."""
-        sensor = {"id": "CAM001", "type": "Camera", "observes": "traffic:VehicleCount"}
+        sensor = _SENSOR
 
-        sosa_sensor = {
-            "@id": f"urn:sensor:{sensor['id']}",
-            "@type": "sosa:Sensor",
-            "sosa:observes": sensor["observes"],
-        }
+        sosa_sensor = _SENSOR_TEMPLATE.copy()
+        sosa_sensor["@id"] = sensor_urn(sensor["id"])
+        sosa_sensor["sosa:observes"] = sensor["observes"]
 
         assert sosa_sensor["@type"] == "sosa:Sensor"
         assert "sosa:observes" in sosa_sensor
+        # Same URN object as the observation's madeBySensor id
+        assert sosa_sensor["@id"] is to_jsonld(_OBSERVATION)["sosa:madeBySensor"]["@id"]